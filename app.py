@@ -1,23 +1,41 @@
-from dash import Dash, dcc, html, Input, Output, State, callback, DiskcacheManager, CeleryManager
+from dash import Dash, dcc, html, Input, Output, State, callback, DiskcacheManager, CeleryManager, no_update
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
 
-from pyrtsched_display import SchedulerDM, SchedulerEDF, Scheduler
+from pyrtsched_display import SchedulerDM, SchedulerEDF, Scheduler, CancellationToken
 from pyrtsched_display import ScheduleDisplay
 import json
 import pandas as pd
 import os
+import time
+import uuid
 
+LIVE_UPDATE_TICKS = 100 # Time units scheduled between two checks for a live update of the graph
+LIVE_UPDATE_SECONDS = 2 # Minimum delay between two live updates of the graph
+LIVE_EXPIRE_SECONDS = 3600 # Live updates are kept one hour
+
+# Live updates are written by the background callback and read by the live_interval callback,
+# numbered so that none is lost or sent twice whatever the polling delays
 if 'REDIS_URL' in os.environ:
     # Use Redis & Celery if REDIS_URL set as an env variable
     from celery import Celery
+    import redis
     celery_app = Celery(__name__, broker=os.environ['REDIS_URL'], backend=os.environ['REDIS_URL'])
     background_callback_manager = CeleryManager(celery_app)
+    live_store = redis.Redis.from_url(os.environ['REDIS_URL'])
+
+    def live_store_set(key, value):
+        live_store.set(key, value, ex=LIVE_EXPIRE_SECONDS)
 
 else:
     # Diskcache for non-production apps when developing locally
     import diskcache
     cache = diskcache.Cache("./cache")
     background_callback_manager = DiskcacheManager(cache)
+    live_store = cache
+
+    def live_store_set(key, value):
+        live_store.set(key, value, expire=LIVE_EXPIRE_SECONDS)
 
 
 app = Dash(__name__, background_callback_manager=background_callback_manager, external_stylesheets=[dbc.themes.BOOTSTRAP, dbc.icons.FONT_AWESOME])
@@ -48,7 +66,10 @@ app.layout = html.Div([
     dbc.Button("Cancel Scheduling !", id='cancel_see_schedule_button', color="secondary", className="me-1", disabled=True),
     dbc.Button([html.I(className="fa-solid fa-file-excel")," Download Schedule"], id='excel_schedule_button', color="primary", outline=True, className="me-1"),
     dcc.Download(id="download_excel_schedule"),
-    dcc.Graph(id='graph',style={'height': '90vh'})
+    dcc.Graph(id='graph',style={'height': '90vh'}),
+    dcc.Store(id='live_job'),
+    dcc.Store(id='live_cursor', data=0),
+    dcc.Interval(id='live_interval', interval=1000, disabled=True)
 ])
 
 @callback(
@@ -76,8 +97,7 @@ def read_schedule_json(json_value) -> dict:
         json_value = json.loads(json_value)
     return json_value
 
-def prepare_schedule(json_value: dict) -> Scheduler:
-    max_time = json_value["max_time"]
+def create_scheduler(json_value: dict) -> Scheduler:
     scheduler_name = json_value["scheduler"]
 
     if (scheduler_name == "DM"):
@@ -88,59 +108,127 @@ def prepare_schedule(json_value: dict) -> Scheduler:
         scheduler = SchedulerDM()
 
     scheduler.configure_json(json_value)
+    return scheduler
+
+def prepare_schedule(json_value: dict) -> Scheduler:
+    max_time = json_value["max_time"]
+    scheduler = create_scheduler(json_value)
     scheduler.schedule(max_time)
 
     return scheduler
 
+def push_live_update(job: str, nb_updates: int, update) -> int:
+    # Return the number of updates of the job
+    if update is None:
+        return nb_updates
+    live_store_set(f"{job}:{nb_updates}", json.dumps(update))
+    live_store_set(f"{job}:count", nb_updates + 1)
+    return nb_updates + 1
+
 @callback(
     Output("progress", "value"), Output("progress", "max"), Output("progress", "label"), Output("progress", "animated"),
     Input('cancel_see_schedule_button', 'n_clicks'),
+    State('live_job', 'data'),
     prevent_initial_call=True,
 )
-def cancel_display_graph(n_clicks):
-    return str(0), str(3), "Waiting...", False
+def cancel_display_graph(n_clicks, job):
+    # display_graph stops at its next progress call and displays the schedule computed so far
+    if job is not None:
+        live_store_set(f"{job}:cancel", 1)
+    return no_update, no_update, "Cancelling...", True
     
 @callback(
-    Output('graph', 'figure'),
+    Output('graph', 'figure', allow_duplicate=True), Output('live_job', 'data'), Output('live_cursor', 'data'),
     Input('see_schedule_button', 'n_clicks'),
     State('schedule_json_conf', 'value'),
+    prevent_initial_call=True,
+)
+def start_live_graph(n_clicks, value):
+    # Empty graph (activations and deadlines only), filled by extend_live_graph while display_graph computes the schedule
+    if n_clicks is None or value == "":
+        raise PreventUpdate
+    json_value = read_schedule_json(value)
+    graph = ScheduleDisplay(max_time=json_value["max_time"], render="browser")
+    return graph.live_start(create_scheduler(json_value)), uuid.uuid4().hex, 0
+
+@callback(
+    Output('graph', 'extendData'), Output('live_cursor', 'data', allow_duplicate=True),
+    Input('live_interval', 'n_intervals'),
+    State('live_job', 'data'),
+    State('live_cursor', 'data'),
+    prevent_initial_call=True,
+)
+def extend_live_graph(n_intervals, job, cursor):
+    # Only the segments computed since the previous call are sent
+    if job is None or live_store.get(f"{job}:done") is not None:
+        raise PreventUpdate
+    count = live_store.get(f"{job}:count")
+    count = int(count) if count is not None else 0
+    if count <= cursor:
+        raise PreventUpdate
+    updates = [json.loads(live_store.get(f"{job}:{n}")) for n in range(cursor, count)]
+    return ScheduleDisplay.merge_live_updates(updates), count
+
+@callback(
+    Output('graph', 'figure', allow_duplicate=True),
+    Input('live_job', 'data'),
+    State('schedule_json_conf', 'value'),
     background=True,
     running=[
         (Output("see_schedule_button", "disabled"), True, False),
         (Output("cancel_see_schedule_button", "disabled"), False, True),
+        (Output("live_interval", "disabled"), False, True),
     ],
-    cancel=Input("cancel_see_schedule_button", "n_clicks"),
     progress=[Output("progress", "value"), Output("progress", "max"), Output("progress", "label"), Output("progress", "animated")],
     prevent_initial_call=True,
 )
-def display_graph(set_progress, n_clicks, value):
-    total_progress = 3
-    current_progress = 0
-    set_progress((str(current_progress), str(total_progress), "Read JSON...", True))
+def display_graph(set_progress, job, value):
+    # Progress in percent: the schedule up to 90%, then the graph
+    total_progress = 100
+    schedule_progress = 90
+    set_progress((str(0), str(total_progress), "Read JSON...", True))
 
     graphJSON = {}
-    if n_clicks > 0:
+    if job is not None:
         print("Generate Graph")
         print(value)
         if (value!=""):
             json_value = read_schedule_json(value)
 
-            current_progress += 1
-            set_progress((str(current_progress), str(total_progress), "Generate Schedule...", True))
-
             max_time = json_value["max_time"]
-            schedule = prepare_schedule(json_value)
-
-            current_progress += 1
-            set_progress((str(current_progress), str(total_progress), "Generate Graph...", True))
-
-            # Prepare the schedule for display
+            schedule = create_scheduler(json_value)
+            # Same traces as the graph of start_live_graph
             graph = ScheduleDisplay(max_time=max_time, render="browser")
+            graph.live_start(schedule)
+
+            # Every LIVE_UPDATE_SECONDS, report the progress and send the new segments to the graph
+            cancel_token = CancellationToken()
+            live = {"updates": 0, "last_update": time.monotonic()}
+            def on_progress(current_time, max_time):
+                if live_store.get(f"{job}:cancel") is not None:
+                    cancel_token.cancel()
+                if time.monotonic() - live["last_update"] >= LIVE_UPDATE_SECONDS:
+                    percent = current_time * schedule_progress // max(max_time, 1)
+                    set_progress((str(percent), str(total_progress), f"Generate Schedule... {current_time}/{max_time}", True))
+                    live["updates"] = push_live_update(job, live["updates"], graph.live_update(schedule))
+                    live["last_update"] = time.monotonic()
+
+            set_progress((str(0), str(total_progress), "Generate Schedule...", True))
+            schedule.schedule(max_time, progress=on_progress, progress_interval=LIVE_UPDATE_TICKS, cancel_token=cancel_token)
+            push_live_update(job, live["updates"], graph.live_update(schedule))
+
+            set_progress((str(schedule_progress), str(total_progress), "Generate Graph...", True))
+
+            # Prepare the schedule for display, up to the cancellation if any
             graph.update_from_scheduler(schedule)
             graphJSON = graph.fig
+            # The complete figure replaces the live one, stop extending it
+            live_store_set(f"{job}:done", 1)
 
-            current_progress += 1
-            set_progress((str(current_progress), str(total_progress), "Finished", False))
+            if cancel_token.cancelled:
+                set_progress((str(total_progress), str(total_progress), f"Cancelled at time {schedule.current_time}", False))
+            else:
+                set_progress((str(total_progress), str(total_progress), "Finished", False))
     
     return graphJSON
 
@@ -0,0 +1,47 @@
+"""
+Benchmark of the name lookups used by the scheduler hot path.
+
+Measures TaskSet.get_task, ResourceSet.get_resource and the scheduler cost per tick
+for growing task counts. Run with: python benchmarks/bench_lookups.py
+
+Only the lookups stay flat. The tick cost still grows with the task count: each tick checks the activation
+of every task and captures the state of every task, both O(tasks). Without the indexed lookups it would grow
+quadratically; the "tick / task" column shows that it is now linear.
+"""
+import os
+import sys
+import time
+import logging
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pyrtsched_display import TaskSet, ResourceSet, SchedulerDM
+
+logging.getLogger("pyrtsched_display.scheduler").setLevel(logging.ERROR)
+
+def build_tasks(num_tasks, period=1000):
+    """Tasks with the same period, so that the number of jobs per tick only depends on num_tasks."""
+    return [{"Name": f"T{i+1}", "O": i % period, "C": 1, "D": period, "T": period} for i in range(num_tasks)]
+
+def bench_lookups(num_tasks, number=100000):
+    taskset = TaskSet(build_tasks(num_tasks))
+    resourceset = ResourceSet(num_tasks)
+    last_task = f"T{num_tasks}"
+    last_resource = f"P{num_tasks-1}"
+    task_time = timeit.timeit(lambda: taskset.get_task(last_task), number=number) / number
+    resource_time = timeit.timeit(lambda: resourceset.get_resource(last_resource), number=number) / number
+    return task_time, resource_time
+
+def bench_tick(num_tasks, max_time=200):
+    scheduler = SchedulerDM()
+    scheduler.configure(TaskSet(build_tasks(num_tasks)), ResourceSet(1))
+    start = time.perf_counter()
+    scheduler.schedule(max_time=max_time)
+    return (time.perf_counter() - start) / max_time
+
+if __name__ == "__main__":
+    print(f"{'Tasks':>6} {'get_task (ns)':>14} {'get_resource (ns)':>18} {'tick (us)':>10} {'tick / task (us)':>17}")
+    for num_tasks in [10, 100, 1000]:
+        task_time, resource_time = bench_lookups(num_tasks)
+        tick_time = bench_tick(num_tasks)
+        print(f"{num_tasks:>6} {task_time*1e9:>14.1f} {resource_time*1e9:>18.1f} {tick_time*1e6:>10.1f} {tick_time/num_tasks*1e6:>17.2f}")
@@ -0,0 +1,258 @@
+"""
+Benchmark suite of the scheduling engine, the display and the file I/O, with results stored as JSON.
+
+Scheduler cases vary one parameter at a time around a base configuration (task count, horizon, number of
+processors, DM or EDF, memory options). Processor cases keep at least TASKS_PER_PROCESSOR tasks per processor
+and one memory per two processors, so that every case is schedulable. Display cases time ScheduleDisplay.update and fig_generate, I/O cases
+the Excel and JSON export and reload. Task sets are generated from a fixed seed, so runs are comparable.
+
+Run and compare with:
+    python benchmarks/bench_suite.py run --output baseline.json
+    python benchmarks/bench_suite.py run --output current.json
+    python benchmarks/bench_suite.py compare baseline.json current.json --threshold 0.10
+compare exits with status 1 when a case is slower than the baseline by more than the threshold.
+"""
+import os
+import sys
+import json
+import time
+import random
+import logging
+import platform
+import argparse
+import datetime
+import statistics
+import subprocess
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pyrtsched_display import SchedulerDM, SchedulerEDF, ScheduleDisplay
+
+logging.getLogger("pyrtsched_display").setLevel(logging.ERROR)
+
+SCHEDULERS = {"DM": SchedulerDM, "EDF": SchedulerEDF}
+PERIODS = (10, 20, 25, 40, 50, 100) # Hyperperiod of 200 whatever the task set
+SEED = 2024
+TASKS_PER_PROCESSOR = 4
+BASE = {"num_tasks": 10, "max_time": 1000, "nb_processors": 2, "scheduler": "DM", "memory": "default"}
+MEMORY_OPTIONS = {
+    "default": {},
+    "no_premption_memory": {"premption_memory": False},
+    "memory_use_processor": {"memory_use_processor": True},
+    "memory_non_resumable_global": {"memory_non_resumable_global": True},
+}
+VARIATIONS = {
+    "num_tasks": [5, 10, 20, 50],
+    "max_time": [200, 1000, 5000],
+    "nb_processors": [1, 2, 4, 32],
+    "scheduler": ["DM", "EDF"],
+    "memory": list(MEMORY_OPTIONS),
+}
+
+def build_tasks(num_tasks, nb_processors, utilization=0.6, seed=SEED):
+    """
+    R/E/W tasks (single-phase C tasks for one task in four, or when the budget is below 3 ticks) with a total
+    utilization of about utilization per processor. The budget of a task is rounded down (at least one tick)
+    and capped at min(D, T): with fewer tasks than utilization * nb_processors, the total is lower.
+    """
+    rng = random.Random(f"{seed}-{num_tasks}-{nb_processors}")
+    tasks = []
+    task_utilization = utilization * nb_processors / num_tasks
+    # Periods long enough for a budget of at least one tick, so that rounding up never overloads the set
+    periods = [period for period in PERIODS if period * task_utilization >= 1] or [max(PERIODS)]
+    for i in range(num_tasks):
+        period = rng.choice(periods)
+        # A task can not use more than one processor: its budget is capped at min(D, T)
+        budget = min(max(1, int(period * task_utilization)), period)
+        if i % 4 == 3 or budget < 3:
+            tasks.append({"Name": f"T{i+1}", "O": rng.randint(0, period - 1), "C": budget, "D": period, "T": period})
+        else:
+            # Every phase lasts at least one tick: a job never goes past an empty phase
+            read = rng.randint(1, budget // 3)
+            write = rng.randint(1, budget // 3)
+            execute = budget - read - write
+            tasks.append({"Name": f"T{i+1}", "O": rng.randint(0, period - 1), "R": read, "E": execute, "W": write, "D": period, "T": period})
+    return tasks
+
+def build_configuration(num_tasks, nb_processors, scheduler, memory, **kwargs):
+    configuration = {
+        "scheduler": scheduler,
+        "premption_processor": True,
+        "premption_memory": True,
+        "memory_use_processor": False,
+        "nb_processors": nb_processors,
+        # The memory phases of many processors would saturate a single memory
+        "nb_memories": max(1, nb_processors // 2),
+        "tasks": build_tasks(num_tasks, nb_processors),
+    }
+    configuration.update(MEMORY_OPTIONS[memory])
+    return configuration
+
+def build_scheduler(configuration):
+    scheduler = SCHEDULERS[configuration["scheduler"]]()
+    scheduler.configure_json(dict(configuration))
+    return scheduler
+
+def scheduler_cases():
+    """One case per value of each parameter, the others at their base value (the base case is only listed once)."""
+    cases = {}
+    for parameter, values in VARIATIONS.items():
+        for value in values:
+            params = dict(BASE, **{parameter: value})
+            if parameter == "nb_processors":
+                # At least TASKS_PER_PROCESSOR tasks per processor, so that no task has to exceed a utilization of one
+                params["num_tasks"] = max(params["num_tasks"], TASKS_PER_PROCESSOR * params["nb_processors"])
+            name = "scheduler/" + "-".join(f"{key}={params[key]}" for key in BASE)
+            if name in cases:
+                continue
+            def run(params=params):
+                configuration = build_configuration(**params)
+                return lambda: build_scheduler(configuration).schedule(max_time=params["max_time"])
+            cases[name] = (params, run)
+    return cases
+
+def display_cases(max_time=200):
+    params = dict(BASE, max_time=max_time)
+    def scheduled():
+        scheduler = build_scheduler(build_configuration(**params))
+        scheduler.schedule(max_time=max_time)
+        return scheduler
+
+    def update():
+        scheduler = scheduled()
+        graph = ScheduleDisplay(max_time=max_time)
+        return lambda: graph.update_from_scheduler(scheduler)
+
+    def fig_generate():
+        graph = ScheduleDisplay(max_time=max_time)
+        graph.update_from_scheduler(scheduled())
+        return graph.fig_generate
+
+    return {
+        f"display/update-max_time={max_time}": (params, update),
+        f"display/fig_generate-max_time={max_time}": (params, fig_generate),
+    }
+
+def io_cases(directory, max_time=1000):
+    params = dict(BASE, max_time=max_time)
+    json_filename = os.path.join(directory, "configuration.json")
+    excel_filename = os.path.join(directory, "schedule.xlsx")
+    def scheduled():
+        scheduler = build_scheduler(build_configuration(**params))
+        scheduler.schedule(max_time=max_time)
+        return scheduler
+
+    def export_excel():
+        schedule_result = scheduled().schedule_result
+        return lambda: schedule_result.to_excel(excel_filename, index=False)
+
+    def export_json():
+        scheduler = scheduled()
+        return lambda: scheduler.export_configuration_to_json(json_filename)
+
+    def load_from_files():
+        scheduler = scheduled()
+        scheduler.export_configuration_to_json(json_filename)
+        scheduler.schedule_result.to_excel(excel_filename, index=False)
+        return lambda: SchedulerDM().load_from_files(json_filename, excel_filename)
+
+    return {
+        f"io/export_excel-max_time={max_time}": (params, export_excel),
+        f"io/export_json-max_time={max_time}": (params, export_json),
+        f"io/load_from_files-max_time={max_time}": (params, load_from_files),
+    }
+
+def measure(setup, repeat):
+    """Time repeat calls of the function returned by setup, setup excluded."""
+    function = setup()
+    function() # Warm up (imports, caches)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return times
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def run(output, repeat=5, pattern=None):
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        cases = {**scheduler_cases(), **display_cases(), **io_cases(directory)}
+        for name, (params, setup) in cases.items():
+            if pattern is not None and pattern not in name:
+                continue
+            times = measure(setup, repeat)
+            results[name] = {"params": params, "min": min(times), "median": statistics.median(times), "times": times}
+            print(f"{name:<100} {min(times)*1e3:>10.2f} ms (median {statistics.median(times)*1e3:.2f} ms)")
+
+    data = {
+        "metadata": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "seed": SEED,
+        },
+        "results": results,
+    }
+    if output is not None:
+        with open(output, "w") as json_file:
+            json.dump(data, json_file, indent=4)
+        print(f"Results saved to {output}")
+    return data
+
+def compare(baseline_filename, current_filename, threshold=0.10, min_delta=0.001):
+    """
+    Compare the min time of each case, return the names of the regressions.
+
+    Parameters:
+    - threshold (float): Relative slowdown above which a case is a regression.
+    - min_delta (float): Absolute slowdown in seconds below which a case is never a regression (timer noise).
+    """
+    with open(baseline_filename, "r") as json_file:
+        baseline = json.load(json_file)["results"]
+    with open(current_filename, "r") as json_file:
+        current = json.load(json_file)["results"]
+
+    regressions = []
+    print(f"{'Case':<100} {'Baseline (ms)':>14} {'Current (ms)':>14} {'Change':>8}")
+    for name in sorted(baseline.keys() | current.keys()):
+        if name not in baseline or name not in current:
+            print(f"{name:<100} {'only in ' + ('baseline' if name in baseline else 'current'):>48}")
+            continue
+        before, after = baseline[name]["min"], current[name]["min"]
+        change = (after - before) / before if before > 0 else 0.0
+        flag = ""
+        if change > threshold and after - before > min_delta:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        elif change < -threshold and before - after > min_delta:
+            flag = "  improved"
+        print(f"{name:<100} {before*1e3:>14.2f} {after*1e3:>14.2f} {change*100:>7.1f}%{flag}")
+    print(f"{len(regressions)} regression(s) above {threshold*100:.0f}%")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Run the benchmarks and save the results as JSON")
+    run_parser.add_argument("--output", default="benchmark.json")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--filter", default=None, help="Only run the cases whose name contains this text")
+    compare_parser = commands.add_parser("compare", help="Compare two result files and flag regressions")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10)
+    compare_parser.add_argument("--min-delta", type=float, default=0.001)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        run(args.output, repeat=args.repeat, pattern=args.filter)
+    else:
+        sys.exit(1 if compare(args.baseline, args.current, args.threshold, args.min_delta) else 0)
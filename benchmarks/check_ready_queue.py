@@ -0,0 +1,62 @@
+"""
+Check the lazy removal of the ready queue of SchedulerDM and SchedulerEDF.
+
+After each tick, the counter of stale entries (jobs with no request left, still in the heap) must equal the
+number of such entries, otherwise the heap is compacted too late or never. Task sets include R=0 and W=0
+phases: a job entering a phase without duration stops with no request left. Schedules are also compared with
+a scheduler sorting every job at each tick. Run with: python benchmarks/check_ready_queue.py
+"""
+import os
+import sys
+import random
+import logging
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pyrtsched_display import SchedulerDM, SchedulerEDF, PriorityType
+
+logging.getLogger("pyrtsched_display").setLevel(logging.ERROR)
+
+def random_configuration(rng):
+    tasks = []
+    for i in range(rng.randint(1, 6)):
+        period = rng.choice([4, 6, 8, 10, 12])
+        tasks.append({"Name": f"T{i+1}", "O": rng.randint(0, period), "R": rng.randint(0, 2), "E": rng.randint(1, 3), "W": rng.randint(0, 2), "D": period, "T": period})
+    return {
+        "premption_processor": True,
+        "premption_memory": rng.random() < 0.8,
+        "memory_use_processor": rng.random() < 0.5,
+        "nb_processors": rng.randint(1, 3),
+        "tasks": tasks,
+    }
+
+def check(scheduler_class, configuration, max_time=200):
+    """Return the first time the stale counter is wrong, or None. Also compare with the sorted dispatch."""
+    scheduler = scheduler_class()
+    scheduler.configure_json(dict(configuration))
+    while scheduler.current_time < max_time:
+        scheduler.step()
+        stale = sum(1 for entry in scheduler._ready_queue if entry[2].request == 0)
+        if scheduler._ready_stale != stale:
+            return scheduler.current_time
+
+    reference = scheduler_class()
+    reference.configure_json(dict(configuration))
+    reference._priority_type = PriorityType.Dynamic # Sort every job at each tick, no ready queue
+    reference.schedule(max_time=max_time)
+    assert scheduler.schedule_result.equals(reference.schedule_result), f"{scheduler_class.__name__}: schedule differs from the sorted dispatch for {configuration}"
+    return None
+
+if __name__ == "__main__":
+    rng = random.Random(0)
+    errors = 0
+    nb_runs = 0
+    for _ in range(200):
+        configuration = random_configuration(rng)
+        for scheduler_class in [SchedulerDM, SchedulerEDF]:
+            nb_runs += 1
+            time = check(scheduler_class, configuration)
+            if time is not None:
+                errors += 1
+                print(f"{scheduler_class.__name__}: wrong stale counter at time {time} for {configuration}")
+    print(f"{errors} error(s) over {nb_runs} runs")
+    sys.exit(1 if errors else 0)
@@ -0,0 +1,69 @@
+"""
+Check VectorizedScheduler against SchedulerDM and SchedulerEDF, and compare their speed.
+
+Random single-phase task sets (with offsets and constrained deadlines) are simulated by both engines up to
+their feasibility interval, stopping at the first missed deadline or repeated state. The first missed deadline
+(time and task) and the first repeated state must be identical. Run with: python benchmarks/check_vectorized.py
+"""
+import os
+import sys
+import time
+import random
+import logging
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pyrtsched_display import TaskSet, ResourceSet, SchedulerDM, SchedulerEDF, VectorizedScheduler
+
+logging.getLogger("pyrtsched_display").setLevel(logging.ERROR)
+
+SCHEDULERS = {"DM": SchedulerDM, "EDF": SchedulerEDF}
+
+def random_task_set(rng, max_tasks=5, periods=(2, 3, 4, 5, 6, 8, 10, 12)):
+    tasks = []
+    for i in range(rng.randint(1, max_tasks)):
+        period = rng.choice(periods)
+        deadline = rng.randint(1, period)
+        tasks.append({"Name": f"T{i+1}", "O": rng.randint(0, 2 * period), "C": rng.randint(1, deadline), "D": deadline, "T": period})
+    return tasks
+
+def simulate(task_set, policy, nb_processors):
+    scheduler = SCHEDULERS[policy]()
+    scheduler.configure(TaskSet(task_set), ResourceSet(nb_processors))
+    scheduler.schedule(feasibility_interval=True, stop_on_missed_deadline=True)
+    schedule_result = scheduler.schedule_result
+    missed = schedule_result[(schedule_result["Missed"].notna()) & (schedule_result["Missed"] != "")]
+    verdict = {"Missed": not missed.empty, "MissedTime": -1, "MissedTask": "", "Repeated": False, "PreviousTime": -1, "CurrentTime": -1}
+    if not missed.empty:
+        verdict["MissedTime"] = int(missed.iloc[0]["Finish"])
+        verdict["MissedTask"] = missed.iloc[0]["Task"]
+    if len(scheduler.repeated_states) > 0:
+        verdict["Repeated"] = True
+        verdict["PreviousTime"] = scheduler.repeated_states[0]["PreviousTime"]
+        verdict["CurrentTime"] = scheduler.repeated_states[0]["CurrentTime"]
+    return verdict
+
+def check(num_task_sets=300, seed=0):
+    rng = random.Random(seed)
+    mismatches = 0
+    for policy in SCHEDULERS:
+        for nb_processors in [1, 2]:
+            task_sets = [random_task_set(rng) for _ in range(num_task_sets)]
+            start = time.perf_counter()
+            vectorized = VectorizedScheduler(task_sets, policy, nb_processors).run()
+            vectorized_time = time.perf_counter() - start
+            start = time.perf_counter()
+            for index, task_set in enumerate(task_sets):
+                expected = simulate(task_set, policy, nb_processors)
+                row = vectorized.iloc[index]
+                got = {name: row[name] for name in expected}
+                if got != expected:
+                    mismatches += 1
+                    print(f"Mismatch {policy} m={nb_processors}: {task_set}\n  expected {expected}\n  got      {got}")
+            scheduler_time = time.perf_counter() - start
+            print(f"{policy} m={nb_processors}: {num_task_sets} task sets, scheduler {scheduler_time:.2f}s, vectorized {vectorized_time:.2f}s")
+    return mismatches
+
+if __name__ == "__main__":
+    mismatches = check()
+    print(f"{mismatches} mismatch(es)")
+    sys.exit(1 if mismatches else 0)
@@ -4,6 +4,7 @@ import os
 import pandas as pd
 from pyrtsched_display import SchedulerDM
 from pyrtsched_display import ScheduleDisplay
+from pyrtsched_display import ScheduleCache
 
 def load_task_set(json_filename, config_index=None):
     """
@@ -35,7 +36,7 @@ def load_task_set(json_filename, config_index=None):
     else:
         raise ValueError("Le fichier JSON doit contenir une liste ou un dictionnaire de configurations.")
 
-def display_schedule(json_filename, config_index=None, stop_on_deadline=False, stop_on_repetition=False, display_graph=True, export_repeated_states=True):
+def display_schedule(json_filename, config_index=None, stop_on_deadline=False, stop_on_repetition=False, display_graph=True, export_repeated_states=True, cache_dir=None):
     """
     Charge une configuration de tâches, exécute l'ordonnancement, affiche un graphique et exporte les répétitions d'états.
 
@@ -46,6 +47,7 @@ def display_schedule(json_filename, config_index=None, stop_on_deadline=False, s
     - stop_on_repetition (bool): Arrêter si une répétition d'état est trouvée.
     - display_graph (bool): Afficher le graphique de l'ordonnancement.
     - export_repeated_states (bool): Exporter les répétitions d'états dans un fichier Excel.
+    - cache_dir (str): Répertoire du cache des ordonnancements (None pour toujours simuler).
     """
     # Charger la configuration
     try:
@@ -54,18 +56,27 @@ def display_schedule(json_filename, config_index=None, stop_on_deadline=False, s
         print(f"Erreur lors du chargement de la configuration : {e}")
         return
 
-    # Initialiser le scheduler
-    scheduler = SchedulerDM()
-    scheduler.configure_json(datajson)
-
     # Exécuter l'ordonnancement
     max_time = datajson.get("max_time", 100)
     print(f"Lancement de l'ordonnancement pour un temps maximum de {max_time} unités...")
-    scheduler.schedule(
-        max_time=max_time,
-        stop_on_repeated_state=stop_on_repetition,
-        stop_on_missed_deadline=stop_on_deadline
-    )
+    if cache_dir is not None:
+        # Ce script ordonnance toujours avec DM
+        cache = ScheduleCache(cache_dir)
+        scheduler = cache.schedule(
+            dict(datajson, scheduler="DM"),
+            max_time=max_time,
+            stop_on_repeated_state=stop_on_repetition,
+            stop_on_missed_deadline=stop_on_deadline
+        )
+    else:
+        # Initialiser le scheduler
+        scheduler = SchedulerDM()
+        scheduler.configure_json(datajson)
+        scheduler.schedule(
+            max_time=max_time,
+            stop_on_repeated_state=stop_on_repetition,
+            stop_on_missed_deadline=stop_on_deadline
+        )
 
     # Afficher le graphique si demandé
     if display_graph:
@@ -85,7 +96,7 @@ def display_schedule(json_filename, config_index=None, stop_on_deadline=False, s
 if __name__ == "__main__":
     # Vérifier les arguments de la ligne de commande
     if len(sys.argv) < 2:
-        print("Usage : python display_schedule.py <fichier_json> [index_configuration] [--stop-on-deadline] [--stop-on-repetition] [--no-display-graph] [--no-export-repeated-states]")
+        print("Usage : python display_schedule.py <fichier_json> [index_configuration] [--stop-on-deadline] [--stop-on-repetition] [--no-display-graph] [--no-export-repeated-states] [--cache=<répertoire>]")
         sys.exit(1)
 
     json_file = sys.argv[1]
@@ -94,10 +105,11 @@ if __name__ == "__main__":
     stop_on_repetition = "--stop-on-repetition" in sys.argv
     display_graph = "--no-display-graph" not in sys.argv
     export_repeated_states = "--no-export-repeated-states" not in sys.argv
+    cache_dir = next((arg.split("=", 1)[1] for arg in sys.argv if arg.startswith("--cache=")), None)
 
     if not os.path.exists(json_file):
         print(f"Le fichier {json_file} n'existe pas.")
         sys.exit(1)
 
     # Lancer l'affichage de l'ordonnancement
-    display_schedule(json_file, config_index, stop_on_deadline, stop_on_repetition, display_graph, export_repeated_states)
\ No newline at end of file
+    display_schedule(json_file, config_index, stop_on_deadline, stop_on_repetition, display_graph, export_repeated_states, cache_dir)
\ No newline at end of file
@@ -1,23 +1,7 @@
-import math
-
 import pandas as pd
-from pyrtsched_display import SchedulerDM
+from pyrtsched_display import SchedulerDM, TaskSet
 from pyrtsched_display import ScheduleDisplay
 
-def lcm(a, b):
-    """Calculate the Least Common Multiple of two numbers."""
-    return abs(a * b) // math.gcd(a, b)
-
-def calculate_hyperperiod(task_set):
-    """Calculate the hyperperiod (LCM of all task periods) from the 'tasks' structure in datajson."""
-    periods = [task.get("T") for task in task_set if "T" in task]
-    if not periods:
-        raise ValueError("No valid periods ('T') found in the task set.")
-    hyperperiod = periods[0]
-    for period in periods[1:]:
-        hyperperiod = lcm(hyperperiod, period)
-    return hyperperiod
-
 datajson = {
     "max_time": 80,
     "scheduler": "DM",
@@ -106,21 +90,25 @@ stop_on_missed_deadline = True
 
 
 max_time = datajson["max_time"]
-# Calculate the hyperperiod (LCM of all task periods)
+# Schedule at least up to the feasibility interval (max offset plus twice the hyperperiod)
 task_set = datajson["tasks"]
-hyperperiod = calculate_hyperperiod(task_set)
-max_offset = max(task.get("O", 0) for task in task_set)
-max_time = max_time if max_time > hyperperiod * 2 + max_offset else hyperperiod * 2 + max_offset
+taskset = TaskSet(task_set)
+max_time = max(max_time, taskset.feasibility_interval)
 
-print(f"Hyperperiod + MaxO: {hyperperiod + max_offset}, Max Time: {max_time}")
+print(f"Hyperperiod + MaxO: {taskset.hyperperiod + taskset.max_first_activation}, Max Time: {max_time}")
 scheduler = SchedulerDM()
 scheduler.configure_json(datajson)
+# Keep every captured state, to export them below
+scheduler.record_state_history = True
+# Time the stages of each tick, printed below
+scheduler.collect_stats = True
 
 scheduler.schedule(
     max_time=max_time,
     stop_on_repeated_state=stop_on_repeated_state,
     stop_on_missed_deadline=stop_on_missed_deadline
 )
+print(scheduler.stats)
 
 # Save the schedule to an Excel file
 if scheduler.schedule_result is not None:
@@ -146,8 +134,9 @@ if (do_graph):
     graph.fig.show()
 
 # Iterate through the previous states and display the required information
-if scheduler._previous_states:
-    """for state, time in scheduler._previous_states:
+state_history = scheduler.state_history
+if state_history:
+    """for state, time in state_history:
         print(f"Time: {time}")
         #print(state)
         # Display tasks in alphabetical order
@@ -183,7 +172,7 @@ if scheduler._previous_states:
     df = pd.DataFrame(data, columns=columns)
 
     # Populate the DataFrame with the state information
-    for state, time in scheduler._previous_states:
+    for state, time in state_history:
         # Update task information
         tasks = state[state["Type"] == "Task"].sort_values(by="Name")
         for _, row in tasks.iterrows():
@@ -200,8 +189,17 @@ if scheduler._previous_states:
     df.to_excel("schedule_states.xlsx", index=False)
     print(df)
 
+# Reuse the schedules already computed for this configuration (a longer max_time resumes from a shorter one):
+#cache = ScheduleCache("schedule_cache")
+#scheduler = cache.schedule(datajson, max_time=max_time, stop_on_repeated_state=stop_on_repeated_state, stop_on_missed_deadline=stop_on_missed_deadline)
+
+# For long horizons, stream the schedule result to a sink (csv, parquet or binary log) before scheduling:
+#scheduler.sink = open_schedule_sink("schedule.csv")
+#scheduler.schedule(max_time=max_time)
+#scheduler.close_sink()
+
 #scheduler_read = SchedulerDM()
-#scheduler_read.load_from_files("configuration.json", "schedule.xlsx")
+#scheduler_read.load_from_files("configuration.json", "schedule.xlsx") # or "schedule.csv" to read the sink lazily
 #graph = ScheduleDisplay(max_time=max_time, render="browser")
 #graph.update_from_scheduler(scheduler_read)
 # Display the schedule on a web browser using Plotly
@@ -1,14 +1,30 @@
 """Display Real-Time Scheduling using Python and Plotly."""
 from .resource import Resource 
 from .resource import ResourceType
+from .resourceset import ResourcePool
 from .resourceset import ResourceSet 
 from .task import TaskPhase
 from .task import Task
 from .taskset import TaskSet
+from .job import Job
+from .schedule_sink import ScheduleSink
+from .schedule_sink import CsvScheduleSink
+from .schedule_sink import ParquetScheduleSink
+from .schedule_sink import BinaryLogScheduleSink
+from .schedule_sink import open_schedule_sink
+from .analysis import Verdict
+from .analysis import SchedulabilityAnalysis
+from .scheduler_stats import SchedulerStats
+from .scheduler import PriorityType
 from .scheduler import Scheduler
+from .scheduler import CancellationToken
 from .scheduler_dm import SchedulerDM
 from .scheduler_edf import SchedulerEDF
 from .schedule_display import ScheduleDisplay
+from .generator import generate_task_set
+from .batch import BatchRunner
+from .vectorized import VectorizedScheduler
+from .schedule_cache import ScheduleCache
 
 __author__ = """Pierre COURBIN"""
 __email__ = "pierre.courbin@gmail.com"
@@ -17,12 +33,28 @@ __version__ = "0.1.0"
 __all__ = [
     "Resource",
     "ResourceType",
+    "ResourcePool",
     "ResourceSet",
     "TaskPhase",
     "Task",
     "TaskSet",
+    "Job",
+    "ScheduleSink",
+    "CsvScheduleSink",
+    "ParquetScheduleSink",
+    "BinaryLogScheduleSink",
+    "open_schedule_sink",
+    "Verdict",
+    "SchedulabilityAnalysis",
+    "SchedulerStats",
+    "PriorityType",
     "Scheduler",
+    "CancellationToken",
     "SchedulerDM",
     "SchedulerEDF",
     "ScheduleDisplay",
+    "generate_task_set",
+    "BatchRunner",
+    "VectorizedScheduler",
+    "ScheduleCache",
 ]
\ No newline at end of file
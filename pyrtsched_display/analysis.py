@@ -0,0 +1,202 @@
+import math
+from enum import Enum
+from fractions import Fraction
+from typing import Optional
+from . import ResourceType, Task, TaskSet, ResourceSet
+
+class Verdict(Enum):
+    Accept = 1 # No deadline can be missed, the simulation is not needed
+    Reject = 2 # A deadline will be missed
+    Unknown = 3 # The analysis can not conclude, the task set must be simulated
+
+class SchedulabilityAnalysis:
+    """
+    Analytical pre-filter run before the simulation: utilization bounds, response-time analysis for DM
+    and processor-demand test for EDF, with the R/E/W memory phases of the tasks.
+
+    Reject only uses necessary conditions (a job longer than its deadline, a resource type overloaded).
+    Accept uses the exact uniprocessor tests when every task is made of preemptive processor phases on one
+    processor. Otherwise it uses sufficient tests: while jobs of higher or equal priority are pending, the
+    highest one executes, unless it waits for a lower priority job in a non-preemptive phase (at most one
+    such phase per phase of the job, non-preemptive phases are not analysed when memory uses a processor).
+    A rejected task set may miss its first deadline after the feasibility interval of the TaskSet when
+    a resource type is overloaded.
+
+    Parameters:
+    - taskset (TaskSet): Tasks to analyse.
+    - resourceset (ResourceSet): Processors and memories.
+    - premption_processor, premption_memory, memory_use_processor, memory_non_resumable_global (bool): Scheduler options.
+    """
+    _taskset = None
+    _resourceset = None
+    _premption = {}
+    _memory_use_processor = False
+    _memory_non_resumable_global = False
+
+    def __init__(self, taskset: TaskSet, resourceset: ResourceSet, premption_processor=True, premption_memory=True, memory_use_processor=False, memory_non_resumable_global=False):
+        self._taskset = taskset
+        self._resourceset = resourceset
+        self._premption = {
+            ResourceType.Processor: premption_processor,
+            ResourceType.Memory: premption_memory
+        }
+        self._memory_use_processor = memory_use_processor
+        self._memory_non_resumable_global = memory_non_resumable_global
+
+    @property
+    def tasks(self) -> list[Task]:
+        return self._taskset.tasks
+
+    def necessary(self) -> tuple[Verdict, str]:
+        """Necessary conditions only, for schedulers without a dedicated test."""
+        verdict = self._necessary_conditions()
+        if verdict is not None:
+            return verdict
+        return Verdict.Unknown, "Necessary conditions are met, no sufficient test for this scheduler."
+
+    def dm(self) -> tuple[Verdict, str]:
+        """Analysis for SchedulerDM. Return the verdict and its reason."""
+        verdict = self._necessary_conditions()
+        if verdict is not None:
+            return verdict
+        verdict = self._unsupported()
+        if verdict is not None:
+            return verdict
+
+        if self._is_uniprocessor_preemptive():
+            # Response-time analysis (exact for synchronous activations, sufficient otherwise)
+            for task in self.tasks:
+                higher = [other for other in self.tasks if other is not task and other.deadline <= task.deadline]
+                response_time = self._response_time(task.wcet, task.deadline, lambda r: sum(math.ceil(r / other.period) * other.wcet for other in higher))
+                if response_time is None:
+                    # Equal deadlines are ordered by activation, the bound is then not exact
+                    exact = self._is_synchronous() and all(other.deadline < task.deadline for other in higher)
+                    if exact:
+                        return Verdict.Reject, f"Response time of task {task.name} exceeds its deadline {task.deadline}."
+                    return Verdict.Unknown, f"Response time bound of task {task.name} exceeds its deadline {task.deadline}."
+            return Verdict.Accept, "Response times are lower than the deadlines."
+
+        for task in self.tasks:
+            # Busy period of the jobs with a priority higher or equal to the task: each job may also wait
+            # for lower priority jobs in non-preemptive phases
+            level = [other for other in self.tasks if other.deadline <= task.deadline]
+            lower = [other for other in self.tasks if other.deadline > task.deadline]
+            costs = {other: other.wcet + self._blocking(other, lower) for other in level}
+            busy_period = self._response_time(0, task.deadline, lambda r: sum(math.ceil(max(r, 1) / other.period) * costs[other] for other in level))
+            if busy_period is None:
+                return Verdict.Unknown, f"Busy period bound of task {task.name} exceeds its deadline {task.deadline}."
+        return Verdict.Accept, "Busy period bounds are lower than the deadlines."
+
+    def edf(self) -> tuple[Verdict, str]:
+        """Analysis for SchedulerEDF. Return the verdict and its reason."""
+        verdict = self._necessary_conditions()
+        if verdict is not None:
+            return verdict
+        verdict = self._unsupported()
+        if verdict is not None:
+            return verdict
+
+        if self._is_uniprocessor_preemptive():
+            # Processor-demand test (exact for synchronous activations, sufficient otherwise)
+            deadline = self._first_demand_overflow({task: task.wcet for task in self.tasks})
+            if deadline is None:
+                return Verdict.Accept, "Processor demand is lower than the length of every interval."
+            if self._is_synchronous():
+                return Verdict.Reject, f"Processor demand exceeds the length of the interval [0, {deadline}]."
+            return Verdict.Unknown, f"Processor demand bound exceeds the length of the interval [0, {deadline}]."
+
+        # Demand test where each job may also wait for jobs with a later deadline in non-preemptive phases
+        costs = {task: task.wcet + self._blocking(task, self.tasks) for task in self.tasks}
+        if sum(Fraction(costs[task], task.period) for task in self.tasks) > 1:
+            return Verdict.Unknown, "Demand bound with non-preemptive blocking exceeds the capacity."
+        deadline = self._first_demand_overflow(costs)
+        if deadline is not None:
+            return Verdict.Unknown, f"Demand bound exceeds the length of the interval [0, {deadline}]."
+        return Verdict.Accept, "Demand bounds are lower than the length of every interval."
+
+    def _necessary_conditions(self) -> Optional[tuple[Verdict, str]]:
+        """Reject the task set when a condition needed by any schedule is not met."""
+        for task in self.tasks:
+            if any(duration <= 0 for duration in task.phase_durations):
+                # A job with an empty phase is never executed further, the simulation is needed
+                return Verdict.Unknown, f"Task {task.name} has a phase without duration."
+
+        for task in self.tasks:
+            if task.wcet > task.deadline:
+                return Verdict.Reject, f"Execution time {task.wcet} of task {task.name} exceeds its deadline {task.deadline}."
+
+        nb_processors = len(self._resourceset.get_resources_by_type(ResourceType.Processor))
+        nb_memories = len(self._resourceset.get_resources_by_type(ResourceType.Memory))
+        utilization_processor = Fraction(0)
+        utilization_memory = Fraction(0)
+        for task in self.tasks:
+            demand = task.demand_by_type
+            utilization_memory += Fraction(demand[ResourceType.Memory], task.period)
+            utilization_processor += Fraction(demand[ResourceType.Processor], task.period)
+            if self._memory_use_processor:
+                # A memory phase uses a processor too
+                utilization_processor += Fraction(demand[ResourceType.Memory], task.period)
+        if utilization_processor > nb_processors:
+            return Verdict.Reject, f"Processor utilization {float(utilization_processor):.3f} exceeds {nb_processors} processor(s)."
+        if utilization_memory > nb_memories:
+            return Verdict.Reject, f"Memory utilization {float(utilization_memory):.3f} exceeds {nb_memories} memory(ies)."
+        return None
+
+    def _unsupported(self) -> Optional[tuple[Verdict, str]]:
+        """Options for which no sufficient test is available."""
+        if any(task.deadline > task.period for task in self.tasks):
+            return Verdict.Unknown, "Deadlines larger than periods are not analysed."
+        if self._memory_non_resumable_global or any(not phase.resumable for task in self.tasks for phase in task.phases if phase.ressource_type == ResourceType.Memory):
+            return Verdict.Unknown, "Non resumable memory phases are not analysed."
+        if self._memory_use_processor and self._has_non_preemptive_phase():
+            return Verdict.Unknown, "Non-preemptive phases are not analysed when memory phases use a processor."
+        return None
+
+    def _is_non_preemptive(self, phase) -> bool:
+        return not phase.premption or not self._premption[phase.ressource_type]
+
+    def _has_non_preemptive_phase(self) -> bool:
+        return any(self._is_non_preemptive(phase) for task in self.tasks for phase in task.phases)
+
+    def _is_uniprocessor_preemptive(self) -> bool:
+        """Every task is preemptive processor phases only, on a single processor."""
+        if len(self._resourceset.get_resources_by_type(ResourceType.Processor)) != 1:
+            return False
+        return all(phase.ressource_type == ResourceType.Processor and not self._is_non_preemptive(phase) for task in self.tasks for phase in task.phases)
+
+    def _is_synchronous(self) -> bool:
+        return len({task.first_activation for task in self.tasks}) <= 1
+
+    def _blocking(self, task: Task, lower: list[Task]) -> int:
+        """Time a job of task can wait for lower priority jobs in non-preemptive phases: the longest one per phase of the job."""
+        blocking = 0
+        for resource_type in task.phase_resource_types:
+            blocking += max((phase.duration for other in lower for phase in other.phases if phase.ressource_type == resource_type and self._is_non_preemptive(phase)), default=0)
+        return blocking
+
+    def _response_time(self, execution: int, deadline: int, interference) -> Optional[int]:
+        """Smallest fixed point of r = execution + interference(r), or None when it exceeds the deadline."""
+        response_time = execution
+        while response_time <= deadline:
+            next_response_time = execution + interference(response_time)
+            if next_response_time == response_time:
+                return response_time
+            response_time = next_response_time
+        return None
+
+    def _first_demand_overflow(self, costs: dict[Task, int]) -> Optional[int]:
+        """First absolute deadline L (activations at 0) where the cost of the jobs due by L exceeds L, or None."""
+        utilization = sum(Fraction(costs[task], task.period) for task in self.tasks)
+        max_deadline = max(task.deadline for task in self.tasks)
+        # Intervals to check: up to the hyperperiod plus the largest deadline, or the smaller bound when utilization < 1
+        limit = self._taskset.hyperperiod + max_deadline
+        if utilization < 1:
+            bound = sum((task.period - task.deadline) * Fraction(costs[task], task.period) for task in self.tasks) / (1 - utilization)
+            limit = min(limit, max(max_deadline, math.ceil(bound)))
+
+        deadlines = sorted({deadline for task in self.tasks for deadline in range(task.deadline, limit + 1, task.period)})
+        for deadline in deadlines:
+            demand = sum(((deadline - task.deadline) // task.period + 1) * costs[task] for task in self.tasks if deadline >= task.deadline)
+            if demand > deadline:
+                return deadline
+        return None
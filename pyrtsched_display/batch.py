@@ -0,0 +1,176 @@
+import os
+import json
+import signal
+import random
+import logging
+import multiprocessing
+from typing import Iterator, Optional
+from . import TaskSet, SchedulerDM, SchedulerEDF, Verdict
+from .generator import generate_task_set
+
+logger = logging.getLogger(__name__)
+
+SCHEDULERS = {"DM": SchedulerDM, "EDF": SchedulerEDF}
+
+def _init_worker(log_level: int):
+    # Ctrl+C is handled by the main process, which stops the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.getLogger("pyrtsched_display").setLevel(log_level)
+
+def _run_task_set(args: tuple) -> dict:
+    """Generate, analyse and simulate one task set. Run in a worker process."""
+    index, seed, generation, configuration, output_dir = args
+    result = {"index": index, "seed": seed, "status": "failed", "max_time": 0, "configuration": None}
+
+    # Each task set has its own random stream, results do not depend on the worker nor the order of completion
+    rng = random.Random(f"{seed}:{index}")
+    try:
+        task_set = generate_task_set(generation["num_tasks"], generation["max_period"], generation["max_total_utilization"], generation["max_task_utilization"], rng=rng)
+    except ValueError as e:
+        result["error"] = str(e)
+        return result
+    max_time = TaskSet(task_set).feasibility_interval
+    result["max_time"] = max_time
+
+    datajson = dict(configuration)
+    datajson.update({
+        "max_time": max_time,
+        "tasks": task_set,
+        "deadline_missed": None,  # Placeholder for missed deadline info
+        "repeated_state": None,  # Placeholder for repeated state info
+        "analysis": None,  # Placeholder for analytical verdict
+    })
+    result["configuration"] = datajson
+    scheduler = SCHEDULERS[datajson["scheduler"]]()
+    scheduler.configure_json(datajson)
+
+    # Analytical pre-filter: a rejected task set misses a deadline, no need to simulate it
+    verdict, reason = scheduler.analyse()
+    datajson["analysis"] = {"verdict": verdict.name, "reason": reason}
+    if verdict == Verdict.Reject:
+        result["status"] = "missed"
+        return result
+
+    scheduler.schedule(feasibility_interval=True, stop_on_missed_deadline=True)
+
+    schedule_result = scheduler.schedule_result
+    missed_deadlines = schedule_result[(schedule_result["Missed"].notna()) & (schedule_result["Missed"] != "")]
+    if not missed_deadlines.empty:
+        first_missed = missed_deadlines.iloc[0]
+        datajson["deadline_missed"] = {
+            "time": int(first_missed["Finish"]),
+            "task": first_missed["Task"],
+            "job": first_missed["Job"]
+        }
+        result["status"] = "missed"
+
+    if len(scheduler.repeated_states) > 0:
+        first_repeated = scheduler.repeated_states[0]
+        datajson["repeated_state"] = {
+            "start_time": first_repeated["PreviousTime"],
+            "end_time": first_repeated["CurrentTime"]
+        }
+        if missed_deadlines.empty:
+            result["status"] = "repeated"
+    elif missed_deadlines.empty:
+        result["status"] = "no_repetition"
+        # Save the task set and schedule from the worker, the main process only collects the results
+        if output_dir is not None:
+            task_set_filename = os.path.join(output_dir, f"{index + 1}_task_set.json")
+            schedule_filename = os.path.join(output_dir, f"{index + 1}_schedule.xlsx")
+            with open(task_set_filename, "w") as f:
+                json.dump(datajson, f, indent=4)
+            schedule_result.to_excel(schedule_filename, index=False)
+            result["files"] = [task_set_filename, schedule_filename]
+    return result
+
+class BatchRunner:
+    """
+    Generate and simulate task sets on a pool of processes, for schedulability campaigns.
+
+    Task set i is generated from its own random stream, seeded with (seed, i): a campaign is reproducible
+    whatever the number of processes. Results are returned as they complete, and counters are kept up to date.
+
+    Parameters:
+    - num_task_sets (int): Number of task sets to generate and test.
+    - num_tasks (int): Maximum number of tasks per task set.
+    - max_period (int): Maximum period for tasks.
+    - max_total_utilization (float): Maximum total utilization for all tasks.
+    - max_task_utilization (float): Maximum utilization for a single task.
+    - configuration (dict): Scheduler options of configure_json ("scheduler", "nb_processors", "premption_processor", ...).
+    - seed (int): Seed of the campaign, drawn at random when None.
+    - processes (int): Number of worker processes, the number of CPUs when None.
+    - output_dir (str): Directory where the workers save the task sets without repetition and their schedule, nothing saved when None.
+    """
+    _num_task_sets = 0
+    _generation = {} # Parameters of generate_task_set
+    _configuration = {} # Scheduler options, completed with the tasks by each worker
+    _seed = 0
+    _processes = None
+    _output_dir = None
+    _log_level = logging.ERROR
+    _counters = {}
+    _pool = None
+
+    def __init__(self, num_task_sets: int, num_tasks: int, max_period: int, max_total_utilization=0.9, max_task_utilization=0.8, configuration: Optional[dict] = None, seed: Optional[int] = None, processes: Optional[int] = None, output_dir: Optional[str] = None, log_level: int = logging.ERROR):
+        self._num_task_sets = num_task_sets
+        self._generation = {
+            "num_tasks": num_tasks,
+            "max_period": max_period,
+            "max_total_utilization": max_total_utilization,
+            "max_task_utilization": max_task_utilization,
+        }
+        self._configuration = {
+            "scheduler": "DM",
+            "premption_processor": True,
+            "premption_memory": False,
+            "memory_use_processor": False,
+            "nb_processors": 1,
+        }
+        if configuration is not None:
+            self._configuration.update(configuration)
+        assert self._configuration["scheduler"] in SCHEDULERS, f"Unknown scheduler {self._configuration['scheduler']}, expected one of {list(SCHEDULERS)}."
+        self._seed = seed if seed is not None else random.randrange(2**32)
+        self._processes = processes
+        self._output_dir = output_dir
+        self._log_level = log_level
+        self._counters = {"tested": 0, "missed": 0, "repeated": 0, "no_repetition": 0, "failed": 0}
+        self._pool = None
+
+    @property
+    def seed(self) -> int:
+        return self._seed
+
+    @property
+    def counters(self) -> dict:
+        """Number of task sets tested (generated), and by status: missed, repeated, no_repetition (usable) and failed (generation)."""
+        return dict(self._counters)
+
+    def run(self) -> Iterator[dict]:
+        """
+        Yield the result of each task set as soon as it completes. A result holds the "index" and "seed" of the
+        task set, its "status", its "max_time" and its "configuration" (the configure_json data with the tasks,
+        the first missed deadline, the first repeated state and the analysis).
+        Ctrl+C stops the pool, the results already returned are kept.
+        """
+        if self._output_dir is not None and not os.path.exists(self._output_dir):
+            os.makedirs(self._output_dir)
+        logger.info(f"Running {self._num_task_sets} task sets with seed {self._seed}.")
+
+        arguments = ((index, self._seed, self._generation, self._configuration, self._output_dir) for index in range(self._num_task_sets))
+        self._pool = multiprocessing.Pool(self._processes, initializer=_init_worker, initargs=(self._log_level,))
+        try:
+            for result in self._pool.imap_unordered(_run_task_set, arguments):
+                if result["status"] != "failed":
+                    self._counters["tested"] += 1
+                self._counters[result["status"]] += 1
+                yield result
+            self._pool.close()
+            self._pool.join()
+        except KeyboardInterrupt:
+            logger.warning("CTRL+C detected! Stopping the workers...")
+        finally:
+            # Also stops the workers when the caller does not consume every result
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
@@ -0,0 +1,69 @@
+import random
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+def generate_task_set(num_tasks_max, max_period, max_total_utilization=0.9, max_task_utilization=0.8, rng: Optional[random.Random] = None):
+    """
+    Generate a set of tasks with constraints on utilization.
+
+    Parameters:
+    - num_tasks_max (int): Maximum number of tasks to generate.
+    - max_period (int): Maximum period for tasks.
+    - max_total_utilization (float): Maximum total utilization for all tasks.
+    - max_task_utilization (float): Maximum utilization for a single task.
+    - rng (random.Random): Random generator, the global one of the random module when None.
+
+    Returns:
+    - list: A list of generated tasks.
+    """
+    generator = rng if rng is not None else random # Module functions share the global generator
+    tasks = []
+    total_utilization = 0.0
+    max_attempts = 100  # Maximum attempts to generate a valid task
+
+    for i in range(num_tasks_max):
+        attempts = 0
+        while attempts < max_attempts:
+            task = {
+                "Name": f"T{i+1}",
+                #"O": generator.randint(0, max_period // 2),
+                "O": 0,
+                "R": generator.randint(1, 3),
+                "E": generator.randint(1, max_period // 6),
+                "W": generator.randint(1, 3),
+                "D": generator.randint(1, max_period),
+                "T": generator.randint(1, max_period)
+            }
+            # Ensure T >= R + E + W
+            if task["T"] < (task["R"] + task["E"] + task["W"]):
+                logger.debug(f"Adjust period for task {task['Name']}: T={task['T']}, R={task['R']}, E={task['E']}, W={task['W']}")
+                task["T"] = generator.randint(task["R"] + task["E"] + task["W"], max_period)
+            # Ensure D <= T
+            if task["D"] > task["T"] or task["D"] < (task["R"] + task["E"] + task["W"]):
+                logger.debug(f"Adjust deadline for task {task['Name']}: D={task['D']}, T={task['T']}, R={task['R']}, E={task['E']}, W={task['W']}")
+                task["D"] = generator.randint(max(1, task["R"] + task["E"] + task["W"]), task["T"])
+
+            
+            # Calculate task utilization
+            utilization = (task["R"] + task["E"] + task["W"]) / task["T"]
+            
+            # Ensure task utilization <= max_task_utilization and total utilization <= max_total_utilization
+            if utilization <= max_task_utilization and (total_utilization + utilization) <= max_total_utilization:
+                tasks.append(task)
+                total_utilization += utilization
+                break
+            attempts += 1
+        
+        # If no valid task could be generated after max_attempts, stop adding tasks
+        if attempts == max_attempts:
+            logger.warning(f"Could not generate a valid task after {max_attempts} attempts for task {i+1}.")
+            break
+
+    # Ensure at least 2 tasks are generated
+    if len(tasks) < 2:
+        logger.warning("Could not generate at least 2 valid tasks with the given constraints.")
+        raise ValueError("Could not generate at least 2 valid tasks with the given constraints.")
+    
+    return tasks
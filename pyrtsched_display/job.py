@@ -0,0 +1,39 @@
+from . import Task
+
+class Job:
+    """Runtime record of one task activation, used by the scheduler hot path."""
+    __slots__ = ("id", "name", "task", "activation", "phase", "request", "executed", "non_preemptive_resources", "absolute_deadline", "priority", "last_dispatch_time", "last_dispatch_resources")
+
+    def __init__(self, id: int, task: Task, activation: int):
+        self.id = id
+        self.name = task.name + "_" + str(activation)
+        self.task = task
+        self.activation = activation
+        self.phase = 0
+        self.request = task.phase_durations[0]
+        self.executed = False
+        self.non_preemptive_resources = [] # List of Resource kept while a non-preemptive phase runs
+        self.absolute_deadline = activation + task.deadline
+        self.priority = 0 # Cached by the scheduler when the priority does not change during the job life
+        self.last_dispatch_time = None # Last time unit executed
+        self.last_dispatch_resources = [] # List of Resource used at last_dispatch_time
+
+    def __str__(self):
+        return "Job: " + self.name + " (Phase = " + str(self.phase) + ", Request = " + str(self.request) + ")"
+
+    @property
+    def non_preemptive_resource(self) -> str:
+        return ", ".join(resource.name for resource in self.non_preemptive_resources)
+
+    def to_dict(self):
+        """Convert the job to a dictionary format, with the columns of the schedule current table."""
+        return {
+            "Job": self.name,
+            "Task": self.task.name,
+            "Activation": self.activation,
+            "Phase": self.phase,
+            "Request": self.request,
+            "Executed": self.executed,
+            "NonPreemptiveResource": self.non_preemptive_resource,
+            "AbsoluteDeadline": self.absolute_deadline,
+        }
@@ -7,8 +7,10 @@ class ResourceType(Enum):
 class Resource:
     _name = ""
     _type = ResourceType.Processor
+    _resourceset = None # ResourceSet owning the resource, notified when the name or type changes
 
     def __init__(self, name, type):
+        self._resourceset = None
         self._name = name
         self._type = type
 
@@ -22,6 +24,8 @@ class Resource:
     @name.setter
     def name(self, value: str):
         self._name = value
+        if self._resourceset is not None:
+            self._resourceset._update_index()
 
     @property
     def type(self):
@@ -29,4 +33,14 @@ class Resource:
     
     @type.setter
     def type(self, value: ResourceType):
-        self._type = value
\ No newline at end of file
+        self._type = value
+        if self._resourceset is not None:
+            self._resourceset._update_index()
+
+    @property
+    def resourceset(self):
+        return self._resourceset
+
+    @resourceset.setter
+    def resourceset(self, value):
+        self._resourceset = value
\ No newline at end of file
@@ -1,19 +1,93 @@
 import json
 import pandas as pd
+from typing import Optional
 from . import ResourceType, Resource
 
+class ResourcePool:
+    """
+    Free resources of one type during a scheduler tick. allocate and take are O(1) amortized, reset frees every resource.
+
+    The free resources are a stack holding the lowest position on top, so that allocate returns the first free
+    resource in ResourceSet order, as a scan of the resource list would. A resource taken or allocated is only
+    marked as busy, its stack entry is skipped when it reaches the top.
+
+    There is no release: the scheduler rebuilds the free resources at each tick and never frees one within a tick,
+    so the pool is reset once per tick, in O(resources) (two list builds) instead of one O(1) release per resource.
+    """
+    _resources = []
+    _positions = {} # Position of each resource in the pool
+    _stack = [] # Positions of the free resources, lowest on top (may hold entries of busy resources)
+    _free = [] # Free flag by position
+    _available = 0
+
+    def __init__(self, resources: list[Resource]):
+        self._resources = list(resources)
+        self._positions = {resource: position for position, resource in enumerate(self._resources)}
+        self.reset()
+
+    def __len__(self):
+        return len(self._resources)
+
+    @property
+    def available(self) -> int:
+        """Number of free resources."""
+        return self._available
+
+    def reset(self):
+        """Free every resource of the pool."""
+        self._stack = list(range(len(self._resources) - 1, -1, -1))
+        self._free = [True] * len(self._resources)
+        self._available = len(self._resources)
+
+    def allocate(self) -> Optional[Resource]:
+        """Take the first free resource, None if every resource is busy."""
+        if self._available == 0:
+            return None
+        stack = self._stack
+        free = self._free
+        position = stack.pop()
+        while not free[position]:
+            position = stack.pop()
+        free[position] = False
+        self._available -= 1
+        return self._resources[position]
+
+    def take(self, resource: Resource):
+        """Take a given resource, e.g. one held by a non-preemptive job."""
+        position = self._positions[resource]
+        assert self._free[position], f"Resource {resource.name} is already busy."
+        self._free[position] = False
+        self._available -= 1
+
 class ResourceSet:
+    """
+    Processors P0, P1, ... and memories. A single memory is named M, several memories M0, M1, ...
+
+    Parameters:
+    - nb_processor (int): Number of processors.
+    - nb_memory (int): Number of memories.
+    """
     _resources = []
+    _resources_by_name = {}
+    _resources_by_type = {}
+    _positions = {} # Position of each resource in the set
+    _pools = None # ResourcePool by type, built on first use
 
-    def __init__(self, nb_processor: int):
+    def __init__(self, nb_processor: int, nb_memory: int = 1):
+        assert nb_memory >= 0, "The number of memories can not be negative."
         self._resources = []
+        self._resources_by_name = {}
+        self._resources_by_type = {resource_type: [] for resource_type in ResourceType}
+        self._positions = {}
+        self._pools = None
 
         for p in range(nb_processor):
             resource = Resource(f"P{p}", ResourceType.Processor)
-            self._resources.append(resource)   
+            self.add_resource(resource)
 
-        resource = Resource("M", ResourceType.Memory)
-        self._resources.append(resource) 
+        for m in range(nb_memory):
+            resource = Resource("M" if nb_memory == 1 else f"M{m}", ResourceType.Memory)
+            self.add_resource(resource)
     
     def __str__(self):
         string = "Resources:\n"
@@ -25,11 +99,45 @@ class ResourceSet:
     def resources(self) -> list[Resource]:
         return self._resources
     
-    def get_resource(self, name: str) -> Resource:
+    def add_resource(self, resource: Resource):
+        resource.resourceset = self
+        self._positions[resource] = len(self._resources)
+        self._resources.append(resource)
+        self._resources_by_name.setdefault(resource.name, resource)
+        self._resources_by_type[resource.type].append(resource)
+        self._pools = None
+
+    def _update_index(self):
+        """Rebuild the name and type indexes, called when a resource of the set is renamed or changes type."""
+        self._resources_by_name = {}
+        self._resources_by_type = {resource_type: [] for resource_type in ResourceType}
         for resource in self._resources:
-            if resource.name == name:
-                return resource
-        return None
+            self._resources_by_name.setdefault(resource.name, resource)
+            self._resources_by_type[resource.type].append(resource)
+        self._pools = None
+
+    def get_resource(self, name: str) -> Resource:
+        return self._resources_by_name.get(name)
+
+    def get_resources_by_type(self, type: ResourceType) -> list[Resource]:
+        """Resources of the given type, in ResourceSet order."""
+        return self._resources_by_type[type]
+
+    def position(self, resource: Resource) -> int:
+        """Position of the resource in ResourceSet order."""
+        return self._positions[resource]
+
+    def free_pools(self) -> dict[ResourceType, ResourcePool]:
+        """
+        Pool of free resources of each type, every resource free. The pools are reused:
+        they are reset by each call and only valid until the next one.
+        """
+        if self._pools is None:
+            self._pools = {resource_type: ResourcePool(resources) for resource_type, resources in self._resources_by_type.items()}
+        else:
+            for pool in self._pools.values():
+                pool.reset()
+        return self._pools
     
     def get_resourceset_as_dataframe(self):
         schema_resourceset={'Name': 'string', 'Type': 'string'}
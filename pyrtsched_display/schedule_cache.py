@@ -0,0 +1,235 @@
+import os
+import json
+import pickle
+import hashlib
+import logging
+from typing import Optional
+from . import TaskSet, Scheduler, SchedulerDM, SchedulerEDF
+
+logger = logging.getLogger(__name__)
+
+SCHEDULERS = {"DM": SchedulerDM, "EDF": SchedulerEDF}
+
+def _as_bool(value) -> bool:
+    # Same conversion as Scheduler.configure_json for options saved as strings
+    if isinstance(value, str):
+        return value == "True"
+    return bool(value)
+
+def schedule_summaries(scheduler: Scheduler) -> dict:
+    """First missed deadline and first repeated state of a schedule, in the format of the task set JSON files."""
+    schedule_result = scheduler.schedule_result
+    missed_deadlines = schedule_result[(schedule_result["Missed"].notna()) & (schedule_result["Missed"] != "")]
+    deadline_missed = None
+    if not missed_deadlines.empty:
+        first_missed = missed_deadlines.iloc[0]
+        deadline_missed = {"time": int(first_missed["Finish"]), "task": first_missed["Task"], "job": first_missed["Job"]}
+    repeated_state = None
+    if len(scheduler.repeated_states) > 0:
+        first_repeated = scheduler.repeated_states[0]
+        repeated_state = {"start_time": first_repeated["PreviousTime"], "end_time": first_repeated["CurrentTime"]}
+    return {"deadline_missed": deadline_missed, "repeated_state": repeated_state}
+
+class ScheduleCache:
+    """
+    On-disk cache of simulations, addressed by a hash of the normalized configuration and of the horizon.
+
+    An entry is a pickled snapshot of the scheduler (schedule result, jobs, states) and, in the index,
+    the summaries of the first missed deadline and repeated state. A cache hit skips the simulation.
+    When only a shorter horizon is cached, the simulation resumes from it (not for event_driven runs,
+    whose rows would be split at the end of the cached horizon). Least recently used entries are removed
+    once the entries exceed max_size bytes.
+
+    Parameters:
+    - directory (str): Directory of the cache, created if needed.
+    - max_size (int): Maximum size of the entries, in bytes.
+    """
+    _index_filename = "index.json"
+    _directory = ""
+    _max_size = 512 * 1024 * 1024
+    _index = {}
+    _counters = {}
+
+    def __init__(self, directory: str, max_size: int = 512 * 1024 * 1024):
+        assert max_size > 0, "The cache size must be positive."
+        self._directory = directory
+        self._max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+        self._index = self._load_index()
+        self._counters = {"hits": 0, "prefix_hits": 0, "misses": 0}
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @property
+    def size(self) -> int:
+        """Size of the entries, in bytes."""
+        return sum(entry["size"] for entry in self._index["entries"].values())
+
+    @property
+    def counters(self) -> dict:
+        """Number of hits, prefix_hits (simulation resumed from a shorter horizon) and misses."""
+        return dict(self._counters)
+
+    def _load_index(self) -> dict:
+        index_filename = os.path.join(self._directory, self._index_filename)
+        if os.path.exists(index_filename):
+            with open(index_filename, "r") as f:
+                index = json.load(f)
+            # Entries whose file was removed by hand are forgotten
+            index["entries"] = {key: entry for key, entry in index["entries"].items() if os.path.exists(self._entry_filename(key))}
+            return index
+        return {"clock": 0, "entries": {}}
+
+    def _save_index(self):
+        index_filename = os.path.join(self._directory, self._index_filename)
+        with open(index_filename + ".tmp", "w") as f:
+            json.dump(self._index, f, indent=4)
+        os.replace(index_filename + ".tmp", index_filename)
+
+    def _entry_filename(self, key: str) -> str:
+        return os.path.join(self._directory, f"{key}.pkl")
+
+    def _touch(self, key: str):
+        self._index["clock"] += 1
+        self._index["entries"][key]["last_used"] = self._index["clock"]
+
+    @staticmethod
+    def _hash(data: dict) -> str:
+        return hashlib.sha256(json.dumps(data, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+    def configuration_key(self, datajson: dict, stop_on_repeated_state=False, stop_on_missed_deadline=False, event_driven=False, feasibility_interval=False) -> str:
+        """Hash of everything that changes the schedule except the horizon: tasks, resources, scheduler and options."""
+        premption_memory = _as_bool(datajson["premption_memory"])
+        memory_non_resumable_global = _as_bool(datajson.get("memory_non_resumable_global", False))
+        if not premption_memory and memory_non_resumable_global:
+            premption_memory = True # Forced by configure_json
+        normalized = {
+            "scheduler": datajson.get("scheduler", "DM"),
+            # Same tasks written with C, R/E/W or Phases give the same key
+            "tasks": [task.to_dict() for task in TaskSet(datajson["tasks"]).tasks],
+            "nb_processors": int(datajson["nb_processors"]),
+            "nb_memories": int(datajson.get("nb_memories", 1)),
+            "premption_processor": _as_bool(datajson["premption_processor"]),
+            "premption_memory": premption_memory,
+            "memory_use_processor": _as_bool(datajson["memory_use_processor"]),
+            "memory_non_resumable_global": memory_non_resumable_global,
+            "merge_intervals": _as_bool(datajson.get("merge_intervals", False)),
+            "stop_on_repeated_state": stop_on_repeated_state,
+            "stop_on_missed_deadline": stop_on_missed_deadline,
+            "event_driven": event_driven,
+            "feasibility_interval": feasibility_interval,
+        }
+        return self._hash(normalized)
+
+    def _entry_key(self, configuration_key: str, max_time: int) -> str:
+        return self._hash({"configuration": configuration_key, "horizon": max_time})
+
+    def _horizon(self, datajson: dict, max_time: int, feasibility_interval: bool) -> int:
+        if feasibility_interval:
+            return TaskSet(datajson["tasks"]).feasibility_interval
+        return max_time
+
+    def lookup(self, datajson: dict, max_time: int = 40, stop_on_repeated_state=False, stop_on_missed_deadline=False, event_driven=False, feasibility_interval=False) -> Optional[dict]:
+        """
+        Summaries of a cached schedule ("deadline_missed", "repeated_state", "current_time"), or None when
+        this exact horizon is not cached. The snapshot is not read.
+        """
+        configuration_key = self.configuration_key(datajson, stop_on_repeated_state, stop_on_missed_deadline, event_driven, feasibility_interval)
+        key = self._entry_key(configuration_key, self._horizon(datajson, max_time, feasibility_interval))
+        entry = self._index["entries"].get(key)
+        if entry is None:
+            return None
+        return {name: entry[name] for name in ["deadline_missed", "repeated_state", "current_time"]}
+
+    def schedule(self, datajson: dict, max_time: int = 40, stop_on_repeated_state=False, stop_on_missed_deadline=False, event_driven=False, feasibility_interval=False) -> Scheduler:
+        """
+        Scheduler configured with datajson and scheduled like Scheduler.schedule, from the cache when possible.
+        The scheduler is chosen by the "scheduler" key of datajson (DM by default).
+        """
+        scheduler_name = datajson.get("scheduler", "DM")
+        assert scheduler_name in SCHEDULERS, f"Unknown scheduler {scheduler_name}, expected one of {list(SCHEDULERS)}."
+        scheduler = SCHEDULERS[scheduler_name]()
+        scheduler.configure_json(datajson)
+        horizon = self._horizon(datajson, max_time, feasibility_interval)
+        configuration_key = self.configuration_key(datajson, stop_on_repeated_state, stop_on_missed_deadline, event_driven, feasibility_interval)
+        key = self._entry_key(configuration_key, horizon)
+
+        if key in self._index["entries"]:
+            self._counters["hits"] += 1
+            logger.info(f"Schedule found in the cache up to time {horizon}.")
+            scheduler.restore(self._read(key))
+            self._touch(key)
+            self._save_index()
+            return scheduler
+
+        prefix_key = None
+        if not event_driven and not feasibility_interval:
+            # Longest cached horizon shorter than the requested one
+            prefixes = [(entry["horizon"], prefix_key) for prefix_key, entry in self._index["entries"].items() if entry["configuration"] == configuration_key and entry["horizon"] < horizon]
+            if prefixes:
+                _, prefix_key = max(prefixes)
+
+        if prefix_key is not None:
+            self._counters["prefix_hits"] += 1
+            prefix_horizon = self._index["entries"][prefix_key]["horizon"]
+            logger.info(f"Schedule found in the cache up to time {prefix_horizon}, resuming up to {horizon}.")
+            scheduler.restore(self._read(prefix_key))
+            self._touch(prefix_key)
+            scheduler.schedule_until(horizon, stop_on_repeated_state, stop_on_missed_deadline)
+        else:
+            self._counters["misses"] += 1
+            scheduler.schedule(max_time=horizon, stop_on_repeated_state=stop_on_repeated_state, stop_on_missed_deadline=stop_on_missed_deadline, event_driven=event_driven, feasibility_interval=feasibility_interval)
+
+        self._write(key, configuration_key, horizon, scheduler)
+        return scheduler
+
+    def _read(self, key: str) -> dict:
+        with open(self._entry_filename(key), "rb") as f:
+            return pickle.load(f)
+
+    def _write(self, key: str, configuration_key: str, horizon: int, scheduler: Scheduler):
+        data = pickle.dumps(scheduler.snapshot(), protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self._max_size:
+            logger.info(f"Schedule of {len(data)} bytes is larger than the cache, not cached.")
+            return
+        with open(self._entry_filename(key) + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(self._entry_filename(key) + ".tmp", self._entry_filename(key))
+        entry = {
+            "configuration": configuration_key,
+            "horizon": horizon,
+            "current_time": scheduler.current_time,
+            "size": len(data),
+        }
+        entry.update(schedule_summaries(scheduler))
+        self._index["entries"][key] = entry
+        self._touch(key)
+        self._evict()
+        self._save_index()
+
+    def _evict(self):
+        """Remove the least recently used entries until the cache fits in max_size."""
+        entries = self._index["entries"]
+        size = self.size
+        for key in sorted(entries, key=lambda key: entries[key]["last_used"]):
+            if size <= self._max_size:
+                break
+            size -= entries[key]["size"]
+            del entries[key]
+            if os.path.exists(self._entry_filename(key)):
+                os.remove(self._entry_filename(key))
+            logger.info(f"Cache entry {key} evicted.")
+
+    def clear(self):
+        """Remove every entry."""
+        for key in list(self._index["entries"]):
+            if os.path.exists(self._entry_filename(key)):
+                os.remove(self._entry_filename(key))
+        self._index = {"clock": 0, "entries": {}}
+        self._save_index()
@@ -1,9 +1,11 @@
 # https://plotly.com/python/gantt/
 import plotly.express as px
+import plotly.graph_objects as go
 import pandas as pd
 import plotly.io as pio
 import pathlib
 import os
+from typing import Optional
 from . import Scheduler
 
 class ScheduleDisplay:
@@ -17,33 +19,37 @@ class ScheduleDisplay:
     _category_list = []
     _schedule = pd.DataFrame()
     _fig = None
+    _patterns = {"Processor": "", "Memory": "x"} # Bar pattern by resource type
+    _hovertemplates = {
+        "Task": "<b>%{base} - %{x}</b><br>Job %{customdata[3]} of %{y} on %{customdata[0]} (%{customdata[1]})<br>Phase %{customdata[4]}/%{customdata[6]}, Request remaining: %{customdata[5]}/%{customdata[7]}<extra></extra>",
+        "Resource": "<b>%{base} - %{x}</b><br>%{y} (%{customdata[1]}) execute Job %{customdata[3]} of %{customdata[0]} <br><extra></extra>",
+    }
+    _live_traces = {} # Trace index of the live figure by (row type, task, resource type)
+    _live_time = 0 # Time up to which the live figure is drawn
+    _live_cursor = None # Cursor of Scheduler.get_schedule_result_since
 
     def __init__(self, max_time=40, render="browser"):
         self._max_time = max_time
         pio.renderers.default = render
 
     def update_from_scheduler(self, scheduler: Scheduler):
-        self.update(scheduler.taskset.get_taskset_as_dataframe(), scheduler.resourceset.get_resourceset_as_dataframe(), scheduler.schedule_result)
+        # Rows after max_time are not displayed, they are not read back from the sink
+        self.update(scheduler.taskset.get_taskset_as_dataframe(), scheduler.resourceset.get_resourceset_as_dataframe(), scheduler.get_schedule_result_as_dataframe(max_start=self._max_time))
 
     def update(self, tasks: pd.DataFrame, resources: pd.DataFrame, schedule: pd.DataFrame):
         self._tasks = tasks.copy()
         self._tasks.set_index('Name', inplace=True)
         self._tasks_list = self._tasks.index.tolist()
-        self._category_list = self._tasks_list + self._ressource_list
 
         self._resources = resources.copy()
-        # Add empty resource for processor, for row with missed deadline and no resource
-        self._resources.loc[len(self._resources)] = ["", "Processor"]
         self._resources.set_index('Name', inplace=True)
         self._ressource_list = self._resources.index.tolist()
         self._category_list = self._tasks_list + self._ressource_list
 
-        self._schedule = schedule.copy().reset_index(drop=True)
-        self._schedule["Start"] = ScheduleDisplay.convert_date(self._schedule["Start"])
-        self._schedule["Finish"] = ScheduleDisplay.convert_date(self._schedule["Finish"])
-
-        self._schedule["Resource_Type"] = self._resources.loc[self._schedule["Resource"]]["Type"].reset_index(drop=True)
-        self._schedule = self._schedule.sort_values(by=['Task', 'Resource'], ascending=False)
+        # Start and Finish stay numeric, the time axis is linear
+        self._schedule = schedule.reset_index(drop=True)
+        # Rows with a missed deadline have no resource, and so no type
+        self._schedule["Resource_Type"] = self._schedule["Resource"].map(self._resources["Type"])
 
         self._fig = None
 
@@ -61,94 +67,146 @@ class ScheduleDisplay:
             self._fig = self.fig_generate()
         return self._fig
 
-    def convert_date(val):
-        date_start = '2020-01-01 00:00:00.'
-        if (isinstance(val, str) == False):
-            if (isinstance(val, pd.Series)):
-                val = val.astype(str).str
-            else:
-                val = str(val)
-        return date_start+val.zfill(4)
-    
+    def _bar_trace(self, row_type: str, task: str, resource_type: str, **data) -> go.Bar:
+        """Horizontal bars of a task on a resource type, on the task row or on the resource rows (row_type "Task" or "Resource")."""
+        colors = px.colors.qualitative.Plotly
+        return go.Bar(
+            orientation="h", name=f"{task}, {resource_type}", legendgroup=f"{task}, {resource_type}", showlegend=(row_type == "Task"),
+            marker=dict(color=colors[self._tasks_list.index(task) % len(colors)], pattern_shape=self._patterns[resource_type]),
+            hovertemplate=self._hovertemplates[row_type], width=self._rect_width, **data
+        )
+
     def fig_add_activation(self, fig):
-        # Plot activations
-        for index in range(len(self._tasks_list)):
-            task = self._tasks.loc[self._tasks_list[index]]
-            activation = int(task["O"])
-            deadline = int(task["O"])+int(task["D"])
-            for t in range(int((self._max_time-int(task["O"]))/int(task["T"])+1)):
-
-                activation_date = ScheduleDisplay.convert_date(activation)
-                deadline_date = ScheduleDisplay.convert_date(deadline)
-                fig.add_annotation(ax = activation_date, axref = 'x', 
-                                x = activation_date, xref = 'x',
-                                ay = index+0.50, ayref = 'y',
-                                y = index-0.45, yref = 'y',
-                                arrowcolor = 'green', arrowwidth = 2,
-                                arrowside = 'end', arrowsize = 1, arrowhead = 2)
-                
-                fig.add_annotation(ax = deadline_date, axref = 'x', 
-                                x = deadline_date, xref = 'x',
-                                ay = index-0.50, ayref = 'y',
-                                y = index+0.45, yref = 'y',
-                                arrowcolor = 'red', arrowwidth = 2,
-                                arrowside = 'end', arrowsize = 1, arrowhead = 2)
-                
-                activation += task["T"]
-                deadline += task["T"]
+        # Plot activations (up arrows) and deadlines (down arrows), one scatter trace for each kind of marker:
+        # one annotation per arrow is far too slow to build and render on long schedules
+        markers = {"Activation": {"x": [], "y": []}, "Deadline": {"x": [], "y": []}}
+        for name in self._tasks_list:
+            task = self._tasks.loc[name]
+            offset, deadline, period = int(task["O"]), int(task["D"]), int(task["T"])
+            activations = range(offset, self._max_time + 1, period)
+            markers["Activation"]["x"].extend(activations)
+            markers["Deadline"]["x"].extend(activation + deadline for activation in activations)
+            for kind in markers:
+                markers[kind]["y"].extend([name] * len(activations))
+
+        for kind, symbol, color in [("Activation", "arrow-up", "green"), ("Deadline", "arrow-down", "red")]:
+            fig.add_trace(go.Scatter(
+                x=markers[kind]["x"], y=markers[kind]["y"],
+                mode="markers", name=kind, legendgroup=kind, showlegend=True,
+                marker=dict(symbol=symbol, size=14, color=color, line=dict(color=color, width=1)),
+                hovertemplate=f"{kind} of %{{y}} at %{{x}}<extra></extra>",
+            ))
         
     def fig_add_missed(self, fig):
-        # Plot missed deadline
-        for index, sched in self._schedule[(self._schedule["Missed"]!="") & (self._schedule["Missed"].isna() == False)].iterrows():
-            index_task = self._category_list.index(sched["Task"])
-            fig.add_shape(type="rect",
-                x0=sched["Start"], x1=sched["Finish"], y0=index_task-self._rect_width/2-0.1, y1=index_task+self._rect_width/2+0.1,
-                line=dict(color="coral", width=10)
-            )
-
-    
+        # Plot missed deadlines as a single trace of vertical marks on the task rows
+        missed = self._schedule[self._schedule["Missed"].fillna("") != ""]
+        fig.add_trace(go.Scatter(
+            x=missed["Start"], y=missed["Task"],
+            customdata=missed[["Job", "Phase", "TotalPhase", "RequestPhaseRemaining", "TotalRequestPhase"]].to_numpy(),
+            mode="markers", name="Missed deadline", showlegend=not missed.empty,
+            marker=dict(symbol="line-ns", size=40, line=dict(color="coral", width=10)),
+            hovertemplate="<b>%{x}</b><br>Job %{customdata[0]} of %{y} missed its deadline<br>Phase %{customdata[1]}/%{customdata[2]}, Request remaining: %{customdata[3]}/%{customdata[4]}<extra></extra>",
+        ))
 
     def fig_generate(self):
-        # Plots Timelines
-        hovertemplate_task = "<b>%{base|%S%4f} - %{x|%S%4f}</b><br>Job %{customdata[3]} of %{y} on %{customdata[0]} (%{customdata[1]})<br>Phase %{customdata[4]}/%{customdata[6]}, Request remaining: %{customdata[5]}/%{customdata[7]}<extra></extra>"
-        tasks_plot = px.timeline(self._schedule, x_start="Start", x_end="Finish", y="Task", color="Task", 
-                        pattern_shape="Resource_Type", pattern_shape_map={"Memory": "x", "Processor": ""}, 
-                        custom_data=["Resource", "Resource_Type", "Missed", "Job", "Phase", "RequestPhaseRemaining", "TotalPhase", "TotalRequestPhase"])
-
-        hovertemplate_ressource = "<b>%{base|%S%4f} - %{x|%S%4f}</b><br>%{y} (%{customdata[1]}) execute Job %{customdata[3]} of %{customdata[0]} <br><extra></extra>"
-        resources_plot = px.timeline(self._schedule, x_start="Start", x_end="Finish", y="Resource", color="Task", 
-                        pattern_shape="Resource_Type", pattern_shape_map={"Memory": "x", "Processor": ""}, 
-                        custom_data=["Task", "Resource_Type", "Missed", "Job"])
-
-        tasks_plot.update_layout(
-            showlegend=True,
-            xaxis_tickformatstops = [
-                dict(dtickrange=[None, 1], value="%S%4f"),
-                dict(dtickrange=[1, None], value="%S%L")
-            ]
-        )
-        tasks_plot.update_traces(hovertemplate=hovertemplate_task)
-
-        resources_plot.update_layout(showlegend=False)
-        resources_plot.update_traces(hovertemplate=hovertemplate_ressource)
-        # https://stackoverflow.com/questions/67964550/add-custom-markers-to-gantt-chart-in-plotly
-        #fig = go.Figure(data=tasks_plot.data + resources_plot.data, layout=resources_plot.layout)
-        self._fig = tasks_plot 
-        self._fig.add_traces(resources_plot.data)
-
-        # set showlegend property by name of trace
-        for trace in self._fig['data']: 
-            if(trace['y'][0] not in self._tasks_list): trace['showlegend'] = False
-
-        self._fig.update_xaxes(rangeslider_visible=True)
+        # Plots Timelines: bars from Start (base) of length Finish - Start, on the task row and on the resource row.
+        # A single pass over the rows grouped by task and resource type gives both traces of each group
+        schedule = self._schedule[self._schedule["Resource"].fillna("") != ""]
+        groups = schedule.groupby(["Task", "Resource_Type"], sort=False).indices
+        task_traces = []
+        resource_traces = []
+        for task in self._tasks_list:
+            for resource_type in self._patterns:
+                positions = groups.get((task, resource_type))
+                if positions is None:
+                    continue
+                rows = schedule.iloc[positions]
+                base = rows["Start"].to_numpy()
+                length = rows["Finish"].to_numpy() - base
+                task_traces.append(self._bar_trace("Task", task, resource_type, base=base, x=length, y=rows["Task"].to_numpy(),
+                    customdata=rows[["Resource", "Resource_Type", "Missed", "Job", "Phase", "RequestPhaseRemaining", "TotalPhase", "TotalRequestPhase"]].to_numpy()))
+                resource_traces.append(self._bar_trace("Resource", task, resource_type, base=base, x=length, y=rows["Resource"].to_numpy(),
+                    customdata=rows[["Task", "Resource_Type", "Missed", "Job"]].to_numpy()))
+
+        self._fig = go.Figure(data=task_traces + resource_traces)
+        self._fig.update_layout(barmode="overlay", showlegend=True)
+        self._fig.update_xaxes(type="linear", rangeslider_visible=True)
         self._fig.update_yaxes(categoryorder='array', categoryarray = self._category_list, autorange="reversed")
-        self._fig.update_traces(width=self._rect_width)
 
         self.fig_add_activation(self._fig)
         self.fig_add_missed(self._fig)
 
         return self._fig
     
+    def live_start(self, scheduler: Scheduler) -> go.Figure:
+        """
+        Empty figure to draw a schedule while it is computed: one trace per task, resource type and row type
+        (task rows, then resource rows), filled by live_update. Activations and deadlines are drawn up to max_time.
+        """
+        self.update(scheduler.taskset.get_taskset_as_dataframe(), scheduler.resourceset.get_resourceset_as_dataframe(), scheduler.get_schedule_result_as_dataframe(max_start=-1))
+        fig = go.Figure()
+        self._live_traces = {}
+        for row_type in ["Task", "Resource"]:
+            for task in self._tasks_list:
+                for resource_type in self._patterns:
+                    self._live_traces[(row_type, task, resource_type)] = len(fig.data)
+                    fig.add_trace(self._bar_trace(row_type, task, resource_type, base=[], x=[], y=[], customdata=[]))
+        self._live_time = 0
+        self._live_cursor = None
+
+        fig.update_layout(barmode="overlay")
+        # Fixed range, the schedule grows from the left
+        fig.update_xaxes(type="linear", range=[0, self._max_time], rangeslider_visible=True)
+        fig.update_yaxes(categoryorder='array', categoryarray = self._category_list, autorange="reversed")
+        self.fig_add_activation(fig)
+        return fig
+
+    def live_update(self, scheduler: Scheduler) -> Optional[list]:
+        """
+        New segments of the schedule since the previous call, up to the current time of the scheduler,
+        as the [data, trace indices] argument of extendData for the figure of live_start. None when nothing is new.
+        A row extended since the previous call only sends its new part.
+        """
+        current_time = min(scheduler.current_time, self._max_time)
+        if current_time <= self._live_time:
+            return None
+        segments = {}
+        rows, self._live_cursor = scheduler.get_schedule_result_since(self._live_cursor)
+        for row in rows[(rows["Resource"] != "") & (rows["Missed"] == "")].itertuples(index=False):
+            start = max(row.Start, self._live_time)
+            finish = min(row.Finish, current_time)
+            if start >= finish:
+                continue
+            resource_type = self._resources.loc[row.Resource]["Type"]
+            task_customdata = [row.Resource, resource_type, row.Missed, row.Job, row.Phase, row.RequestPhaseRemaining, row.TotalPhase, row.TotalRequestPhase]
+            resource_customdata = [row.Task, resource_type, row.Missed, row.Job]
+            for row_type, y, customdata in [("Task", row.Task, task_customdata), ("Resource", row.Resource, resource_customdata)]:
+                trace = segments.setdefault(self._live_traces[(row_type, row.Task, resource_type)], {"base": [], "x": [], "y": [], "customdata": []})
+                trace["base"].append(start)
+                trace["x"].append(finish - start)
+                trace["y"].append(y)
+                trace["customdata"].append([value.item() if hasattr(value, "item") else value for value in customdata])
+        self._live_time = current_time
+        if not segments:
+            return None
+        indices = list(segments.keys())
+        return [{name: [segments[index][name] for index in indices] for name in ["base", "x", "y", "customdata"]}, indices]
+
+    @staticmethod
+    def merge_live_updates(updates: list) -> Optional[list]:
+        """Merge several extendData arguments of live_update into one, in order."""
+        merged = {}
+        for data, indices in updates:
+            for position, index in enumerate(indices):
+                trace = merged.setdefault(index, {})
+                for name, values in data.items():
+                    trace.setdefault(name, []).extend(values[position])
+        if not merged:
+            return None
+        indices = list(merged.keys())
+        names = ["base", "x", "y", "customdata"]
+        return [{name: [merged[index].get(name, []) for index in indices] for name in names}, indices]
+
     def fig_save(self, path="./export/fig.pdf"):
         fig = self.fig
         ext = pathlib.Path(path).suffix
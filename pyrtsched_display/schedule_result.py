@@ -0,0 +1,258 @@
+import pandas as pd
+from typing import Iterator, Optional
+from .schedule_sink import ScheduleSink
+
+class ScheduleResultBuffer:
+    """
+    Append-only columnar storage of schedule result rows, converted to a DataFrame on demand.
+
+    With merge_intervals, a slot that continues the last row of its resource (same job and phase,
+    starting when that row finishes) extends the row instead of adding a new one. RequestPhaseRemaining
+    and NonPreemptiveResource then describe the start of the span.
+
+    With a sink, the rows that can no longer change are written to the sink by chunks of window_size
+    rows, and only the most recent rows stay in memory. Row indices keep counting the rows written to the sink.
+    A sink given to the sink property is owned by the buffer and emptied by clear. A sink attached with
+    load_sink is only read: clear detaches it and never removes its rows.
+    """
+    _schema = {'Task': 'string', 'Job': 'string', 'Start': 'int', 'Finish': 'int', 'Resource': 'string', 'Missed': 'string', 'Phase': 'int', 'RequestPhaseRemaining': 'int', 'TotalPhase': 'int', 'TotalRequestPhase': 'int', 'NonPreemptiveResource': 'string'}
+    _columns = {}
+    _dataframe = None # Cached DataFrame, only without sink
+    _merge_intervals = False
+    _last_rows = {} # Index of the last row by resource name
+    _sink = None
+    _window_size = 10000
+    _first_row = 0 # Index of the first row kept in memory, the previous ones are in the sink
+    _sink_owned = False # The sink was given for writing, clear may empty it
+    _sink_max_finish = 0 # Largest Finish of the rows in the sink
+
+    def __init__(self, merge_intervals: bool = False, sink: Optional[ScheduleSink] = None, window_size: int = 10000):
+        self._columns = {name: [] for name in self._schema}
+        self._dataframe = None
+        self._merge_intervals = merge_intervals
+        self._last_rows = {}
+        self._sink = sink
+        self._sink_owned = sink is not None
+        self._sink_max_finish = 0
+        self._window_size = window_size
+        self._first_row = 0
+
+    def __len__(self):
+        return self._first_row + len(self._columns["Start"])
+
+    def __str__(self):
+        return self.to_dataframe().__str__()
+
+    @property
+    def merge_intervals(self) -> bool:
+        return self._merge_intervals
+
+    @merge_intervals.setter
+    def merge_intervals(self, value: bool):
+        self._merge_intervals = value
+
+    @property
+    def sink(self) -> Optional[ScheduleSink]:
+        return self._sink
+
+    @sink.setter
+    def sink(self, value: Optional[ScheduleSink]):
+        # The rows written to the previous sink are not carried over
+        self.detach_sink()
+        self._sink = value
+        self._sink_owned = value is not None
+        self.clear()
+
+    def detach_sink(self):
+        """Forget the sink without removing its rows. The rows in memory are kept, the rows in the sink are lost to the buffer."""
+        self._sink = None
+        self._sink_owned = False
+
+    @property
+    def first_row_in_memory(self) -> int:
+        """Index of the first row kept in memory, the previous rows are in the sink."""
+        return self._first_row
+
+    @property
+    def window_size(self) -> int:
+        return self._window_size
+
+    @window_size.setter
+    def window_size(self, value: int):
+        assert value > 0, "The window size must be positive."
+        self._window_size = value
+
+    def append(self, task: str, job: str, start: int, finish: int, resource: str, missed: str, phase: int, request_phase_remaining: int, total_phase: int, total_request_phase: int, non_preemptive_resource: str) -> int:
+        """Append a row, or extend the last row of the resource when merging intervals. Return the index of the row."""
+        columns = self._columns
+        if self._merge_intervals and resource != "":
+            row = self._last_rows.get(resource)
+            if row is not None:
+                local_row = row - self._first_row
+                if columns["Finish"][local_row] == start and columns["Job"][local_row] == job and columns["Phase"][local_row] == phase:
+                    columns["Finish"][local_row] = finish
+                    self._dataframe = None
+                    return row
+        columns["Task"].append(task)
+        columns["Job"].append(job)
+        columns["Start"].append(start)
+        columns["Finish"].append(finish)
+        columns["Resource"].append(resource)
+        columns["Missed"].append(missed)
+        columns["Phase"].append(phase)
+        columns["RequestPhaseRemaining"].append(request_phase_remaining)
+        columns["TotalPhase"].append(total_phase)
+        columns["TotalRequestPhase"].append(total_request_phase)
+        columns["NonPreemptiveResource"].append(non_preemptive_resource)
+        self._dataframe = None
+        row = len(self) - 1
+        if resource != "":
+            self._last_rows[resource] = row
+        return row
+
+    def clear(self):
+        for column in self._columns.values():
+            column.clear()
+        self._last_rows = {}
+        self._dataframe = None
+        self._first_row = 0
+        self._sink_max_finish = 0
+        if self._sink is not None:
+            if self._sink_owned:
+                self._sink.reset()
+            else:
+                # Sink attached with load_sink: only read, its rows are kept
+                self._sink = None
+
+    def load_dataframe(self, df: pd.DataFrame):
+        """Replace the buffer content with the rows of a schedule result DataFrame. The sink is detached."""
+        self.detach_sink()
+        self.clear()
+        for name, column in self._columns.items():
+            if name in df.columns:
+                column.extend(df[name].tolist())
+            else:
+                column.extend([""] * len(df))
+        for row, resource in enumerate(self._columns["Resource"]):
+            if isinstance(resource, str) and resource != "":
+                self._last_rows[resource] = row
+        self._dataframe = df
+
+    def load_sink(self, sink: ScheduleSink):
+        """
+        Use the rows of an existing sink as the schedule result, without keeping them in memory.
+        The sink is only read: only its Finish column is read once, for the row count and the largest Finish.
+        """
+        self.detach_sink()
+        self.clear()
+        for chunk in sink.iter_chunks(columns=["Finish"]):
+            self._first_row += len(chunk)
+            if len(chunk) > 0:
+                self._sink_max_finish = max(self._sink_max_finish, int(chunk["Finish"].max()))
+        self._sink = sink
+        self._sink_owned = False
+
+    def last_row_of_resource(self, resource: str) -> Optional[int]:
+        """Index of the last row executed on the resource, or None."""
+        return self._last_rows.get(resource)
+
+    def extend_finish(self, rows: list[int], duration: int):
+        """Push back the Finish of the given rows."""
+        finishes = self._columns["Finish"]
+        for row in rows:
+            finishes[row - self._first_row] += duration
+        self._dataframe = None
+
+    def value(self, name: str, row: int):
+        """Value of a column for a row still in memory."""
+        return self._columns[name][row - self._first_row]
+
+    def rows_since(self, cursor: Optional[tuple] = None) -> tuple[pd.DataFrame, tuple]:
+        """
+        Rows appended or extended since the cursor returned by the previous call (every row in memory when None),
+        and the new cursor. Only the last row of a resource can be extended: the cursor is the number of rows
+        and the last row of each resource.
+        """
+        next_row, open_rows = cursor if cursor is not None else (self._first_row, ())
+        rows = sorted({row for row in open_rows if row >= self._first_row} | set(range(max(next_row, self._first_row), len(self))))
+        local_rows = [row - self._first_row for row in rows]
+        df = pd.DataFrame({name: [column[row] for row in local_rows] for name, column in self._columns.items()}, columns=list(self._schema.keys())).astype(self._schema)
+        return df, (len(self), tuple(self._last_rows.values()))
+
+    def max_finish(self) -> int:
+        """Largest Finish of the schedule result, 0 when it is empty. The sink is not read."""
+        return max(self._sink_max_finish, max(self._columns["Finish"], default=0))
+
+    def flush(self, current_time: int, force: bool = False):
+        """
+        Write to the sink the rows that can no longer change, once the window is full (or always with force).
+        A row stays in memory while it is the last row of its resource and finishes at or after current_time,
+        since it may still be extended.
+        """
+        window = len(self._columns["Start"])
+        if self._sink is None or window == 0 or (window < self._window_size and not force):
+            return
+        finishes = self._columns["Finish"]
+        end = window
+        for row in self._last_rows.values():
+            local_row = row - self._first_row
+            if local_row >= 0 and finishes[local_row] >= current_time:
+                end = min(end, local_row)
+        if end == 0:
+            return
+
+        self._sink.write({name: column[:end] for name, column in self._columns.items()})
+        self._sink_max_finish = max(self._sink_max_finish, max(finishes[:end]))
+        for column in self._columns.values():
+            del column[:end]
+        self._first_row += end
+        # Rows written to the sink can not be extended anymore
+        self._last_rows = {resource: row for resource, row in self._last_rows.items() if row >= self._first_row}
+        self._dataframe = None
+
+    def close(self):
+        """Write every remaining row to the sink and close it. The last rows can not be extended afterwards."""
+        if self._sink is None:
+            return
+        if len(self._columns["Start"]) > 0:
+            self._sink.write({name: list(column) for name, column in self._columns.items()})
+            self._sink_max_finish = max(self._sink_max_finish, max(self._columns["Finish"]))
+            self._first_row += len(self._columns["Start"])
+            for column in self._columns.values():
+                column.clear()
+        self._last_rows = {}
+        self._dataframe = None
+        self._sink.close()
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """Read the rows back chunk by chunk: first the sink, then the rows in memory."""
+        if self._sink is not None:
+            for chunk in self._sink.iter_chunks():
+                yield chunk.reindex(columns=list(self._schema.keys()), fill_value="").astype(self._schema)
+        if len(self._columns["Start"]) > 0:
+            yield pd.DataFrame(self._columns, columns=list(self._schema.keys())).astype(self._schema)
+
+    def to_dataframe(self, max_start: Optional[int] = None) -> pd.DataFrame:
+        """
+        Schedule result as a DataFrame, including the rows written to the sink.
+
+        Parameters:
+        - max_start (int): Only keep the rows starting at or before this time. Chunks are read in time order,
+          so the sink is not read past it.
+        """
+        if self._sink is None and max_start is None:
+            if self._dataframe is None:
+                self._dataframe = pd.DataFrame(self._columns, columns=list(self._schema.keys())).astype(self._schema)
+            return self._dataframe
+
+        chunks = []
+        for chunk in self.iter_chunks():
+            if max_start is not None:
+                if len(chunk) > 0 and chunk["Start"].min() > max_start:
+                    break
+                chunk = chunk[chunk["Start"] <= max_start]
+            chunks.append(chunk)
+        if not chunks:
+            return pd.DataFrame({name: pd.Series(dtype=dtype) for name, dtype in self._schema.items()})
+        # Not cached: with a sink the whole result is only kept in memory by the caller
+        return pd.concat(chunks, ignore_index=True)
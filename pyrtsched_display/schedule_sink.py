@@ -0,0 +1,136 @@
+import os
+import glob
+import importlib.util
+import pickle
+import pathlib
+import pandas as pd
+from abc import ABC, abstractmethod
+from typing import Iterator, Optional
+
+class ScheduleSink(ABC):
+    """
+    Append-only storage of schedule result rows, written in chunks while the simulation advances.
+
+    Chunks are given as a dictionary of column lists, in the order of the schedule result.
+    Rows are read back chunk by chunk, so a long schedule never has to be loaded at once.
+    """
+    _path = ""
+
+    def __init__(self, path: str):
+        self._path = path
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @abstractmethod
+    def write(self, columns: dict[str, list]):
+        """Append a chunk of rows to the sink."""
+        pass
+
+    @abstractmethod
+    def reset(self):
+        """Remove every row written so far."""
+        pass
+
+    @abstractmethod
+    def iter_chunks(self, columns: Optional[list[str]] = None) -> Iterator[pd.DataFrame]:
+        """Read the rows back, one DataFrame per chunk, with every column or only the given columns."""
+        pass
+
+    def close(self):
+        pass
+
+class CsvScheduleSink(ScheduleSink):
+    """CSV file, with a header line written with the first chunk."""
+    _chunksize = 10000
+    _has_header = False
+
+    def __init__(self, path: str, chunksize: int = 10000):
+        super().__init__(path)
+        self._chunksize = chunksize
+        self._has_header = os.path.exists(path) and os.path.getsize(path) > 0
+
+    def write(self, columns: dict[str, list]):
+        pd.DataFrame(columns).to_csv(self._path, mode="a", header=not self._has_header, index=False)
+        self._has_header = True
+
+    def reset(self):
+        if os.path.exists(self._path):
+            os.remove(self._path)
+        self._has_header = False
+
+    def iter_chunks(self, columns: Optional[list[str]] = None) -> Iterator[pd.DataFrame]:
+        if not self._has_header:
+            return
+        # keep_default_na=False: empty strings (no resource, no miss) are read back as ""
+        yield from pd.read_csv(self._path, chunksize=self._chunksize, keep_default_na=False, usecols=columns)
+
+class ParquetScheduleSink(ScheduleSink):
+    """
+    Directory of Parquet files, one file per chunk, readable while the simulation is still writing.
+    Requires a Parquet engine for pandas (pyarrow or fastparquet).
+    """
+    _next_part = 0
+
+    def __init__(self, path: str):
+        if importlib.util.find_spec("pyarrow") is None and importlib.util.find_spec("fastparquet") is None:
+            raise ImportError("ParquetScheduleSink requires pyarrow or fastparquet: pip install pyarrow")
+        super().__init__(path)
+        os.makedirs(path, exist_ok=True)
+        self._next_part = len(self._parts())
+
+    def _parts(self) -> list[str]:
+        return sorted(glob.glob(os.path.join(self._path, "part-*.parquet")))
+
+    def write(self, columns: dict[str, list]):
+        part = os.path.join(self._path, f"part-{self._next_part:06d}.parquet")
+        pd.DataFrame(columns).to_parquet(part, index=False)
+        self._next_part += 1
+
+    def reset(self):
+        for part in self._parts():
+            os.remove(part)
+        self._next_part = 0
+
+    def iter_chunks(self, columns: Optional[list[str]] = None) -> Iterator[pd.DataFrame]:
+        for part in self._parts():
+            yield pd.read_parquet(part, columns=columns)
+
+class BinaryLogScheduleSink(ScheduleSink):
+    """Append-only binary log, each chunk is a pickled dictionary of column lists."""
+
+    def write(self, columns: dict[str, list]):
+        with open(self._path, "ab") as log_file:
+            pickle.dump(columns, log_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def reset(self):
+        if os.path.exists(self._path):
+            os.remove(self._path)
+
+    def iter_chunks(self, columns: Optional[list[str]] = None) -> Iterator[pd.DataFrame]:
+        if not os.path.exists(self._path):
+            return
+        with open(self._path, "rb") as log_file:
+            while True:
+                try:
+                    chunk = pickle.load(log_file)
+                except EOFError:
+                    break
+                if columns is not None:
+                    chunk = {name: chunk[name] for name in columns}
+                yield pd.DataFrame(chunk)
+
+def open_schedule_sink(path: str) -> ScheduleSink:
+    """
+    Open the sink matching the path: ".csv" for CSV, ".parquet" (or a directory) for Parquet,
+    ".log" or ".bin" for the binary log.
+    """
+    ext = pathlib.Path(path).suffix.lower()
+    if ext == ".csv":
+        return CsvScheduleSink(path)
+    elif ext == ".parquet" or os.path.isdir(path):
+        return ParquetScheduleSink(path)
+    elif ext in [".log", ".bin"]:
+        return BinaryLogScheduleSink(path)
+    raise ValueError(f"No schedule sink for {path}: use a .csv, .parquet, .log or .bin path.")
@@ -1,9 +1,15 @@
 import math
+import heapq
 import pandas as pd
 import logging  # Import logging
 from abc import ABC, abstractmethod
-from typing import Optional
-from . import ResourceType, Resource, TaskSet, ResourceSet
+from enum import Enum
+from typing import Callable, Optional
+from . import ResourceType, Resource, TaskSet, ResourceSet, Job
+from .schedule_result import ScheduleResultBuffer
+from .schedule_sink import ScheduleSink, open_schedule_sink
+from .analysis import SchedulabilityAnalysis, Verdict
+from .scheduler_stats import SchedulerStats
 import json
 
 # Configurer le logger
@@ -13,7 +19,30 @@ logging.basicConfig(
     format="%(asctime)s - %(levelname)s - %(name)s - %(message)s"
 )
 
+class PriorityType(Enum):
+    Task = 1 # Priority is static per task (computed once per task)
+    Job = 2 # Priority is fixed per job (computed once at activation)
+    Dynamic = 3 # Priority may change at any time (computed at each tick)
+
+class CancellationToken:
+    """
+    Cooperative cancellation of a running schedule. cancel() can be called from another thread or from
+    the progress hook: the scheduler stops before the next tick, with a consistent partial result.
+    """
+    _cancelled = False
+
+    def __init__(self):
+        self._cancelled = False
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self):
+        self._cancelled = True
+
 class Scheduler(ABC):
+    _priority_type = PriorityType.Dynamic
     _taskset = None
     _resourceset = None
     _schedule_result = None
@@ -21,10 +50,26 @@ class Scheduler(ABC):
         ResourceType.Processor : True,
         ResourceType.Memory: True
     }
-    _schedule_current = None
+    _jobs = {} # Active jobs by job id, in activation order
+    _jobs_by_name = {} # Active jobs by job name
+    _next_job_id = 0
+    _dispatched = [] # (Job, phase) executed during the current tick
+    _dispatched_rows = [] # Result rows written by the dispatches of the current tick
+    _ready_queue = [] # Heap of (priority, job id, Job) for jobs with a remaining request
+    _ready_popped = [] # Heap entries popped during the current tick
+    _ready_stale = 0 # Completed jobs still in the heap
+    _task_priorities = {} # Cached priority by task, for PriorityType.Task
+    _deadline_queue = [] # Heap of (absolute deadline, job id, Job) for jobs not yet finished nor reported missed
+    _missed_jobs = [] # Jobs reported missed and not yet finished
     _current_time = 0
-    _previous_states = []  # List to store previous states
+    _previous_states = {}  # Previous states, mapped to the first time they were seen
     _repeated_states = []  # List to store repeated states
+    _record_state_history = False
+    _track_states = True # Keep the previous states to detect repeated states, see _schedule_until
+    _state_history = []  # List of (state, time), only filled when record_state_history is True
+    _stats = None # SchedulerStats when collect_stats is set
+    # Attributes saved by snapshot, pickled together so that jobs keep pointing to the same tasks and resources
+    _snapshot_attributes = ["_taskset", "_resourceset", "_schedule_result", "_jobs", "_jobs_by_name", "_next_job_id", "_dispatched", "_dispatched_rows", "_ready_queue", "_ready_popped", "_ready_stale", "_task_priorities", "_deadline_queue", "_missed_jobs", "_current_time", "_previous_states", "_repeated_states", "_state_history"]
 
     def __init__(self):
         self._taskset = None
@@ -40,15 +85,25 @@ class Scheduler(ABC):
                            "Forcing premption_memory to True.")
             self._premption[ResourceType.Memory] = True
 
-        schema_schedule_current={'Job': 'string', 'Task': 'string', 'Activation': 'int', 'Phase': 'int', 'Request': 'int', 'Executed': 'bool', 'NonPreemptiveResource': 'string', 'AbsoluteDeadline': 'int'}
-        self._schedule_current = pd.DataFrame(columns=list(schema_schedule_current.keys())).astype(schema_schedule_current)
-        self._schedule_current.set_index('Job', inplace=True)
-
-        schema_schedule_result={'Task': 'string', 'Job': 'string', 'Start': 'int', 'Finish': 'int', 'Resource': 'string', 'Missed': 'string', 'Phase': 'int', 'RequestPhaseRemaining': 'int', 'TotalPhase': 'int', 'TotalRequestPhase': 'int'}
-        self._schedule_result = pd.DataFrame(columns=list(schema_schedule_result.keys())).astype(schema_schedule_result)
-        #self._previous_states = pd.DataFrame(columns=["Clock", "Remaining", "TaskScheduled", "RemainingMem"])
-        self._previous_states = []  # List to store previous states
+        self._jobs = {}
+        self._jobs_by_name = {}
+        self._next_job_id = 0
+        self._dispatched = []
+        self._dispatched_rows = []
+        self._ready_queue = []
+        self._ready_popped = []
+        self._ready_stale = 0
+        self._task_priorities = {}
+        self._deadline_queue = []
+        self._missed_jobs = []
+
+        self._schedule_result = ScheduleResultBuffer()
+        self._previous_states = {}  # Previous states, mapped to the first time they were seen
         self._repeated_states = []
+        self._record_state_history = False
+        self._track_states = True
+        self._state_history = []
+        self._stats = None
 
     
     def __str__(self):
@@ -56,8 +111,36 @@ class Scheduler(ABC):
     
     @property
     def schedule_result(self):
-        return self._schedule_result
-    
+        return self.get_schedule_result_as_dataframe()
+
+    def get_schedule_result_as_dataframe(self, max_start: Optional[int] = None):
+        """
+        Build a DataFrame of the schedule result, reading back the rows written to the sink if any.
+
+        Parameters:
+        - max_start (int): Only keep the rows starting at or before this time, the sink is not read further.
+        """
+        return self._schedule_result.to_dataframe(max_start)
+
+    def get_schedule_result_since(self, cursor: Optional[tuple] = None) -> tuple[pd.DataFrame, tuple]:
+        """
+        Rows of the schedule result appended or extended since the cursor returned by the previous call,
+        and the new cursor, without building the whole DataFrame. Used to follow a schedule computed step by step.
+        Rows already written to the sink are not returned.
+        """
+        return self._schedule_result.rows_since(cursor)
+
+    @property
+    def schedule_current(self):
+        return self.get_schedule_current_as_dataframe()
+
+    def get_schedule_current_as_dataframe(self):
+        """Build a DataFrame view of the active jobs, indexed by job name."""
+        schema_schedule_current={'Job': 'string', 'Task': 'string', 'Activation': 'int', 'Phase': 'int', 'Request': 'int', 'Executed': 'bool', 'NonPreemptiveResource': 'string', 'AbsoluteDeadline': 'int'}
+        df_schedule_current = pd.DataFrame([job.to_dict() for job in self._jobs.values()], columns=list(schema_schedule_current.keys())).astype(schema_schedule_current)
+        df_schedule_current.set_index('Job', inplace=True)
+        return df_schedule_current
+
     @property
     def premption_processor(self):
         return self._premption[ResourceType.Processor]
@@ -82,6 +165,55 @@ class Scheduler(ABC):
     def memory_use_processor(self, value: bool):
         self._memory_use_processor = value
 
+    @property
+    def merge_intervals(self):
+        return self._schedule_result.merge_intervals
+
+    @merge_intervals.setter
+    def merge_intervals(self, value: bool):
+        self._schedule_result.merge_intervals = value
+
+    @property
+    def sink(self) -> Optional[ScheduleSink]:
+        return self._schedule_result.sink
+
+    @sink.setter
+    def sink(self, value: Optional[ScheduleSink]):
+        """
+        Stream the schedule result to a sink, only the last rows are kept in memory. The schedule is restarted.
+
+        The previous states are then only kept when the schedule stops on a repeated state or a cycle: they would
+        grow with every new state (without bound for an overloaded set), and repeated_states stays empty otherwise.
+        With these stops, they are bounded by the number of distinct states before the first repetition.
+        """
+        self._schedule_result.sink = value
+        self._restart_schedule()
+
+    @property
+    def sink_window_size(self) -> int:
+        return self._schedule_result.window_size
+
+    @sink_window_size.setter
+    def sink_window_size(self, value: int):
+        self._schedule_result.window_size = value
+
+    def close_sink(self):
+        """Write the remaining rows to the sink and close it. The schedule can not be extended afterwards."""
+        self._schedule_result.close()
+
+    def snapshot(self) -> dict:
+        """
+        Simulation state (tasks, resources, jobs, queues, results and states), to be pickled and resumed later with restore.
+        The options are not included: restore into a scheduler configured with the same options.
+        """
+        assert self._schedule_result.sink is None, "A schedule streamed to a sink can not be snapshotted."
+        return {name: getattr(self, name) for name in self._snapshot_attributes}
+
+    def restore(self, snapshot: dict):
+        """Resume from a snapshot, schedule_until then continues the schedule where the snapshot stopped."""
+        for name, value in snapshot.items():
+            setattr(self, name, value)
+
     @property
     def taskset(self):
         return self._taskset
@@ -100,9 +232,52 @@ class Scheduler(ABC):
         self._resourceset = value
         self._restart_schedule()
 
+    @property
+    def current_time(self) -> int:
+        """Time up to which the schedule has been computed."""
+        return self._current_time
+
     @property
     def repeated_states(self):
         return self._repeated_states
+
+    @property
+    def cycle(self) -> Optional[dict]:
+        """First cycle of the schedule, as {"Start": time, "Length": length}, or None if no state repeated."""
+        if not self._repeated_states:
+            return None
+        first_repeated_state = self._repeated_states[0]
+        return {
+            "Start": first_repeated_state["PreviousTime"],
+            "Length": first_repeated_state["CurrentTime"] - first_repeated_state["PreviousTime"]
+        }
+
+    @property
+    def record_state_history(self):
+        return self._record_state_history
+
+    @record_state_history.setter
+    def record_state_history(self, value: bool):
+        self._record_state_history = value
+
+    @property
+    def collect_stats(self) -> bool:
+        return self._stats is not None
+
+    @collect_stats.setter
+    def collect_stats(self, value: bool):
+        """Time the stages of each tick in stats, reset when the schedule restarts. Disabled, the cost is a test per stage."""
+        self._stats = SchedulerStats() if value else None
+
+    @property
+    def stats(self) -> Optional[SchedulerStats]:
+        """Statistics of the current schedule, None unless collect_stats is set."""
+        return self._stats
+
+    @property
+    def state_history(self) -> list[tuple[pd.DataFrame, int]]:
+        """States captured at each time, as (DataFrame, time). Requires record_state_history."""
+        return [(self._state_as_dataframe(state), time) for state, time in self._state_history]
     
     @property
     def memory_non_resumable_global(self):
@@ -112,13 +287,14 @@ class Scheduler(ABC):
     def memory_non_resumable_global(self, value: bool):
         self._memory_non_resumable_global = value
 
-    def configure(self, taskset, resourceset, premption_processor=True, premption_memory=True, memory_use_processor=False, memory_non_resumable_global=False):
+    def configure(self, taskset, resourceset, premption_processor=True, premption_memory=True, memory_use_processor=False, memory_non_resumable_global=False, merge_intervals=False):
         self._taskset = taskset
         self._resourceset = resourceset
         self._premption[ResourceType.Processor] = premption_processor
         self._premption[ResourceType.Memory] = premption_memory
         self._memory_use_processor = memory_use_processor
         self._memory_non_resumable_global = memory_non_resumable_global
+        self._schedule_result.merge_intervals = merge_intervals
 
         # Contrôle de cohérence des options mémoire
         if not self._premption[ResourceType.Memory] and self._memory_non_resumable_global:
@@ -130,7 +306,7 @@ class Scheduler(ABC):
     
     def configure_json(self, data_json: dict):
         self._taskset = TaskSet(data_json["tasks"])
-        self._resourceset = ResourceSet(data_json["nb_processors"])
+        self._resourceset = ResourceSet(data_json["nb_processors"], data_json.get("nb_memories", 1))
         if (isinstance(data_json["premption_processor"], str)):
             data_json["premption_processor"] = data_json["premption_processor"]=="True"
         if (isinstance(data_json["premption_memory"], str)):
@@ -141,6 +317,10 @@ class Scheduler(ABC):
             data_json["memory_use_processor"] = data_json["memory_use_processor"]=="True"
         self._memory_use_processor = data_json["memory_use_processor"]
         self._memory_non_resumable_global = data_json.get("memory_non_resumable_global", False)
+        merge_intervals = data_json.get("merge_intervals", False)
+        if (isinstance(merge_intervals, str)):
+            merge_intervals = merge_intervals=="True"
+        self._schedule_result.merge_intervals = merge_intervals
 
         # Contrôle de cohérence des options mémoire
         if not self._premption[ResourceType.Memory] and self._memory_non_resumable_global:
@@ -152,73 +332,148 @@ class Scheduler(ABC):
 
     
 
+    def _schedulability_analysis(self) -> SchedulabilityAnalysis:
+        assert self._taskset is not None, "TaskSet is not set. Cannot analyse tasks."
+        assert self._resourceset is not None, "ResourceSet is not set. Cannot analyse resources."
+        return SchedulabilityAnalysis(self._taskset, self._resourceset, self._premption[ResourceType.Processor], self._premption[ResourceType.Memory], self._memory_use_processor, self._memory_non_resumable_global)
+
+    def analyse(self) -> tuple[Verdict, str]:
+        """
+        Analytical schedulability test of the configured task set, without simulation.
+        Return Accept, Reject or Unknown (simulation needed) with the reason.
+        """
+        return self._schedulability_analysis().necessary()
+
     @abstractmethod
-    def _job_priority(self, job_name: str) -> int: # Job priority. Lower value = higher priority.
+    def _job_priority(self, job: Job) -> int: # Job priority. Lower value = higher priority.
         pass
 
-    def _sort_jobs_by_priority(self) -> list[str]: # Sort jobs by priority
-        assert self._schedule_current is not None, "Schedule current is not set. Cannot sort jobs by priority."
-        jobs_to_execute = self._schedule_current[(self._schedule_current["Request"] > 0) & (self._schedule_current["Executed"] == False)].index.tolist()
+    def _sort_jobs_by_priority(self) -> list[Job]: # Sort jobs by priority
+        jobs_to_execute = [job for job in self._jobs.values() if job.request > 0 and job.executed == False]
         # Call abstract method _job_priority, according to the scheduler algorithm
-        jobs_sorted = sorted(jobs_to_execute, key=lambda job_name: self._job_priority(job_name))
+        jobs_sorted = sorted(jobs_to_execute, key=lambda job: self._job_priority(job))
         return jobs_sorted  
+
+    def _activate_job(self, job: Job):
+        """Add a new job to the active jobs and, unless priorities are dynamic, to the ready queue."""
+        self._jobs[job.id] = job
+        self._jobs_by_name[job.name] = job
+        heapq.heappush(self._deadline_queue, (job.absolute_deadline, job.id, job))
+        if self._priority_type == PriorityType.Dynamic:
+            return
+        if self._priority_type == PriorityType.Task:
+            if job.task not in self._task_priorities:
+                self._task_priorities[job.task] = self._job_priority(job)
+            job.priority = self._task_priorities[job.task]
+        else:
+            job.priority = self._job_priority(job)
+        if job.request > 0:
+            heapq.heappush(self._ready_queue, (job.priority, job.id, job))
+
+    def _jobs_by_priority(self):
+        """
+        Yield the jobs waiting for execution, by priority then activation order.
+
+        Jobs are popped from the ready queue, _restore_ready_queue must be called once the dispatch is done.
+        """
+        if self._priority_type == PriorityType.Dynamic:
+            yield from self._sort_jobs_by_priority()
+            return
+        while self._ready_queue:
+            entry = heapq.heappop(self._ready_queue)
+            job = entry[2]
+            if job.request == 0:
+                # Completed job, removed lazily
+                self._ready_stale -= 1
+                continue
+            self._ready_popped.append(entry)
+            if job.executed == False:
+                yield job
+
+    def _restore_ready_queue(self):
+        for entry in self._ready_popped:
+            if entry[2].request > 0:
+                heapq.heappush(self._ready_queue, entry)
+            else:
+                self._ready_stale -= 1
+        self._ready_popped = []
+        # Drop completed jobs once they are the majority of the heap
+        if self._ready_stale * 2 > len(self._ready_queue):
+            self._ready_queue = [entry for entry in self._ready_queue if entry[2].request > 0]
+            heapq.heapify(self._ready_queue)
+            self._ready_stale = 0
     
-    def _schedule_job_on_resources(self, resources: list[Resource], job: str):
-        assert self._schedule_current is not None, "Schedule current is not set. Cannot schedule job on resources."
-        assert self._taskset is not None, "TaskSet is not set. Cannot schedule job on resources."
-        task_name = self._schedule_current.loc[job]["Task"]
-        job_current_phase = self._schedule_current.loc[job]["Phase"]
-        if isinstance(job_current_phase, pd.Series):
-            job_current_phase = job_current_phase.iloc[0]
-        task = self._taskset.get_task(str(task_name))
-        assert task is not None, f"Task {task_name} not found in TaskSet."
-        task_resource_type = task.phases[int(job_current_phase)].ressource_type
-
-        self._schedule_current.loc[job, "NonPreemptiveResource"] = ""
+    def _schedule_job_on_resources(self, resources: list[Resource], job: Job):
+        task = job.task
+        job_current_phase = job.phase
+        phase = task.phases[job_current_phase]
+        task_resource_type = phase.ressource_type
+
+        job.non_preemptive_resources = []
         for resource in resources:
-            assert(task_resource_type == resource.type or (task_resource_type == ResourceType.Memory and resource.type == ResourceType.Processor and self._memory_use_processor == True)), f"Task {task_name} phase {job_current_phase} resource type {task_resource_type} is not compatible with resource {resource.name} type {resource.type} and memory_use_processor is {self._memory_use_processor}."
+            assert(task_resource_type == resource.type or (task_resource_type == ResourceType.Memory and resource.type == ResourceType.Processor and self._memory_use_processor == True)), f"Task {task.name} phase {job_current_phase} resource type {task_resource_type} is not compatible with resource {resource.name} type {resource.type} and memory_use_processor is {self._memory_use_processor}."
             
-            if (task.phases[job_current_phase].premption == False or (self._premption[task.phases[job_current_phase].ressource_type] == False)):
-                if (self._schedule_current.loc[job, "NonPreemptiveResource"] == ""):
-                    self._schedule_current.loc[job, "NonPreemptiveResource"] = resource.name
-                else:
-                    self._schedule_current.loc[job, "NonPreemptiveResource"] = str(self._schedule_current.loc[job, "NonPreemptiveResource"]) + ", " + str(resource.name)
+            if (phase.premption == False or (self._premption[phase.ressource_type] == False)):
+                job.non_preemptive_resources.append(resource)
 
             # Save schedule result
-            self._schedule_result = pd.concat([self._schedule_result, pd.DataFrame([dict(Task=task_name, Job=job, Start=self._current_time, Finish=self._current_time+1, Resource=resource.name, Missed="", Phase=job_current_phase+1, RequestPhaseRemaining=self._schedule_current.loc[job, "Request"], TotalPhase=len(task.phases), TotalRequestPhase=task.phases[job_current_phase].duration, NonPreemptiveResource=self._schedule_current.loc[job, "NonPreemptiveResource"])])])
+            row = self._schedule_result.append(task.name, job.name, self._current_time, self._current_time+1, resource.name, "", job_current_phase+1, job.request, len(task.phases), phase.duration, job.non_preemptive_resource)
+            self._dispatched_rows.append(row)
         
-        self._schedule_current.loc[job, "Request"] -= 1 # type: ignore
-        self._schedule_current.loc[job, "Executed"] = True
+        job.request -= 1
+        job.executed = True
+        job.last_dispatch_time = self._current_time
+        job.last_dispatch_resources = resources
+        self._dispatched.append((job, job_current_phase))
 
         # Update schedule current with next task phase if task phase is completed
-        if self._schedule_current.loc[job, "Request"] == 0:
-            if (job_current_phase + 1) < len(task.phases):
-                self._schedule_current.loc[job, "Phase"] = (job_current_phase + 1)
-                self._schedule_current.loc[job, "Request"] = task.phases[(job_current_phase + 1)].duration
-                self._schedule_current.loc[job, "NonPreemptiveResource"] = ""
-            #else:
-            #    self._schedule_current.drop([job], inplace=True)
+        if job.request == 0:
+            self._next_job_phase(job)
+
+    def _next_job_phase(self, job: Job):
+        if (job.phase + 1) < len(job.task.phases):
+            job.phase = (job.phase + 1)
+            job.request = job.task.phase_durations[job.phase]
+            job.non_preemptive_resources = []
+        if job.request == 0 and self._priority_type != PriorityType.Dynamic:
+            # Job completed, or stopped by a phase without duration (never executed further):
+            # it is left in the ready queue until popped or compacted
+            self._ready_stale += 1
     
     def _restart_schedule(self):
-        self._schedule_result = self._schedule_result.iloc[0:0] # type: ignore
-        self._schedule_current = self._schedule_current.iloc[0:0] # type: ignore
+        self._schedule_result.clear()
+        self._dispatched_rows = []
+        self._jobs = {}
+        self._jobs_by_name = {}
+        self._next_job_id = 0
+        self._dispatched = []
+        self._ready_queue = []
+        self._ready_popped = []
+        self._ready_stale = 0
+        self._task_priorities = {}
+        self._deadline_queue = []
+        self._missed_jobs = []
         self._current_time = 0
+        self._previous_states = {}
+        self._repeated_states = []
+        self._state_history = []
+        if self._stats is not None:
+            self._stats.reset()
 
-    def _capture_current_state(self):
-        """Capture the current state of tasks and processors."""
-        # Define the schema for the DataFrame with explicit types
-        schema = {
-            "Type": "string",  # "Task" or "Processor"
-            "Name": "string",  # Name of the task or processor
-            "Clock": "float",  # Use float to allow -1 and NaN
-            "Remaining": "float",  # Use float to allow NaN
-            "TaskScheduled": "string",  # Use string for task names
-            "RemainingMem": "float",  # Use float to allow NaN
-        }
-        current_state = pd.DataFrame(columns=list(schema.keys())).astype(schema)
+    def _capture_current_state(self) -> tuple:
+        """
+        Capture the current state of tasks and processors as a hashable fingerprint.
 
+        The fingerprint is a pair of tuples: (Clock, Remaining) of each task, in TaskSet order,
+        and (TaskScheduled, RemainingMem) of each processor, in ResourceSet order.
+        """
         # Capture task states
         assert self._taskset is not None, "TaskSet is not set. Cannot capture task states."
+        task_jobs = {}
+        for job in self._jobs.values():
+            task_jobs.setdefault(job.task, []).append(job)
+
+        tasks_state = []
         for task in self._taskset.tasks:
             first_activation = task.first_activation
             period = task.period
@@ -228,91 +483,80 @@ class Scheduler(ABC):
             else:
                 clock = -1
             
-            job_rows = self._schedule_current[self._schedule_current["Task"] == task.name] # type: ignore
-            if job_rows.empty:
+            jobs = task_jobs.get(task)
+            if not jobs:
                 # Task has not been activated yet or all jobs are finished
                 remaining = 0
             else:
                 # Task is active
-                current_phase = job_rows["Phase"].iloc[0]
-                total_execution_time = sum(phase.duration for phase in task.phases)
-                executed_time = sum(task.phases[phase_index].duration for phase_index in range(current_phase))
-                remaining = total_execution_time - executed_time - task.phases[current_phase].duration + job_rows["Request"].sum()
-
-            current_state = pd.concat([
-                current_state,
-                pd.DataFrame([{
-                    "Type": "Task",
-                    "Name": task.name,
-                    "Clock": clock,
-                    "Remaining": remaining,
-                    "TaskScheduled": "",
-                    "RemainingMem": ""
-                }])
-            ], ignore_index=True)
+                # Execution time of the phases after the current one, plus the remaining requests
+                current_phase = jobs[0].phase
+                remaining = task.wcet - task.phase_offsets[current_phase + 1] + sum(job.request for job in jobs)
+
+            tasks_state.append((clock, remaining))
 
         # Capture processor states
         assert self._resourceset is not None, "ResourceSet is not set. Cannot capture processor states."
-        assert self._schedule_result is not None, "Schedule result is not set. Cannot capture processor states."
-        assert self._schedule_current is not None, "Schedule current is not set. Cannot capture processor states."
-        for processor in [res for res in self._resourceset.resources if res.type == ResourceType.Processor]:
+        processors_state = []
+        for processor in self._resourceset.get_resources_by_type(ResourceType.Processor):
             task_scheduled = ""
             remaining_mem = ""
 
             # Check if a task is scheduled on this processor
-            scheduled_jobs = self._schedule_result[
-                (self._schedule_result["Resource"] == processor.name) &
-                (self._schedule_result["Finish"] == self._current_time)
-            ]
-            if not scheduled_jobs.empty:
-                task_scheduled = scheduled_jobs["Task"].iloc[0]
-                job_scheduled = scheduled_jobs["Job"].iloc[0]
-                task_name = self._schedule_current.loc[job_scheduled]["Task"]
-                job_current_phase = self._schedule_current.loc[job_scheduled]["Phase"]
-                task = self._taskset.get_task(str(task_name))
-                assert task is not None, f"Task {task_name} not found in TaskSet."
-                if task.phases[job_current_phase].ressource_type == ResourceType.Memory:
-                    remaining_mem = self._schedule_current.loc[job_scheduled, "Request"]
-            #if (task_scheduled is not None) or (remaining_mem is not None):
-            new_current_state = pd.DataFrame([{
-                "Type": "Processor",
-                "Name": processor.name,
-                "Clock": math.nan,
-                "Remaining": math.nan,
-                "TaskScheduled": task_scheduled,
-                "RemainingMem": remaining_mem
-            }])
-            current_state = pd.concat([
-                current_state, new_current_state
-            ], ignore_index=True)
-
-        return current_state
+            scheduled_row = self._schedule_result.last_row_of_resource(processor.name)
+            if scheduled_row is not None and self._schedule_result.value("Finish", scheduled_row) == self._current_time:
+                task_scheduled = self._schedule_result.value("Task", scheduled_row)
+                job_scheduled = self._schedule_result.value("Job", scheduled_row)
+                job = self._jobs_by_name[job_scheduled]
+                if job.task.phase_resource_types[job.phase] == ResourceType.Memory:
+                    remaining_mem = job.request
+            processors_state.append((task_scheduled, remaining_mem))
+
+        return (tuple(tasks_state), tuple(processors_state))
+
+    def _state_as_dataframe(self, state: tuple) -> pd.DataFrame:
+        """Rebuild the detailed DataFrame of a state fingerprint."""
+        assert self._taskset is not None, "TaskSet is not set. Cannot rebuild state."
+        assert self._resourceset is not None, "ResourceSet is not set. Cannot rebuild state."
+        # Define the schema for the DataFrame with explicit types
+        schema = {
+            "Type": "string",  # "Task" or "Processor"
+            "Name": "string",  # Name of the task or processor
+            "Clock": "float",  # Use float to allow -1 and NaN
+            "Remaining": "float",  # Use float to allow NaN
+            "TaskScheduled": "string",  # Use string for task names
+            "RemainingMem": "object",  # Empty string or remaining memory request
+        }
+        tasks_state, processors_state = state
+        rows = []
+        for task, (clock, remaining) in zip(self._taskset.tasks, tasks_state):
+            rows.append({"Type": "Task", "Name": task.name, "Clock": clock, "Remaining": remaining, "TaskScheduled": "", "RemainingMem": ""})
+        processors = self._resourceset.get_resources_by_type(ResourceType.Processor)
+        for processor, (task_scheduled, remaining_mem) in zip(processors, processors_state):
+            rows.append({"Type": "Processor", "Name": processor.name, "Clock": math.nan, "Remaining": math.nan, "TaskScheduled": task_scheduled, "RemainingMem": remaining_mem})
+        return pd.DataFrame(rows, columns=list(schema.keys())).astype(schema)
+
+    def _is_comparable_state(self, state: Optional[tuple] = None) -> bool:
+        """A state can be compared once every task has been activated (no Clock at -1)."""
+        if state is None:
+            return False
+        tasks_state, _ = state
+        return all(clock != -1 for clock, _ in tasks_state)
     
-    def _is_repeated_state(self, state: Optional[pd.DataFrame] = None) -> bool:
+    def _is_repeated_state(self, state: Optional[tuple] = None) -> bool:
         """Check if the current state matches any previous state."""
         # Ensure the state is valid for comparison
-        if state is None or state.empty:
-            return False
-
-        # Check if any "Clock" value is -1 in the current state
-        if (state["Clock"] == -1).any():
+        if not self._is_comparable_state(state):
             return False
 
-        # Compare the current state with previous states
-        for previous_state, previous_time in self._previous_states:
-            # Ensure the previous state is valid for comparison
-            if (previous_state["Clock"] == -1).any():
-                continue
-
-            # Compare states without considering the index
-            if state.equals(previous_state): # or (state.empty and previous_state.empty):
-                self._repeated_states.append({
-                    "PreviousTime": previous_time,
-                    "CurrentTime": self._current_time,
-                    "PreviousState": previous_state.copy(),
-                    "CurrentState": state.copy()
-                })
-                return True
+        previous_time = self._previous_states.get(state)
+        if previous_time is not None:
+            self._repeated_states.append({
+                "PreviousTime": previous_time,
+                "CurrentTime": self._current_time,
+                "State": state
+            })
+            return True
 
         return False
     
@@ -326,9 +570,10 @@ class Scheduler(ABC):
             for repeated_state in self._repeated_states:
                 sheet_name = f"{repeated_state['PreviousTime']}_{repeated_state['CurrentTime']}"
                 # Combine CurrentState and PreviousState side by side
+                state = self._state_as_dataframe(repeated_state["State"])
                 combined_state = pd.concat(
-                    [repeated_state["PreviousState"].add_prefix(f"{repeated_state['PreviousTime']}"+"_"), 
-                    repeated_state["CurrentState"].add_prefix(f"{repeated_state['CurrentTime']}"+"_")], 
+                    [state.add_prefix(f"{repeated_state['PreviousTime']}"+"_"), 
+                    state.add_prefix(f"{repeated_state['CurrentTime']}"+"_")], 
                     axis=1
                 )
                 combined_state.to_excel(writer, sheet_name=sheet_name, index=False)
@@ -345,7 +590,8 @@ class Scheduler(ABC):
         assert self._resourceset is not None, "ResourceSet is not set. Cannot export configuration."
         configuration = {
             "tasks": [task.to_dict() for task in self._taskset.tasks],
-            "nb_processors": len(self._resourceset.resources),
+            "nb_processors": len(self._resourceset.get_resources_by_type(ResourceType.Processor)),
+            "nb_memories": len(self._resourceset.get_resources_by_type(ResourceType.Memory)),
             "premption_processor": self._premption[ResourceType.Processor],
             "premption_memory": self._premption[ResourceType.Memory],
             "memory_use_processor": self._memory_use_processor,
@@ -358,200 +604,275 @@ class Scheduler(ABC):
     def load_from_files(self, json_filename: str, excel_filename: str):
         """
         Reload the scheduler from a JSON configuration file and an Excel schedule file.
+        The schedule file may also be a sink (.csv, .parquet, .log or .bin), its rows are then read lazily.
         
         Parameters:
         - json_filename (str): The name of the JSON file containing the configuration.
-        - excel_filename (str): The name of the Excel file containing the schedule results.
+        - excel_filename (str): The name of the Excel file or sink containing the schedule results.
         """
         # Load configuration from JSON
         with open(json_filename, "r") as json_file:
             configuration = json.load(json_file)
         
-        # Reconfigure the scheduler
+        # Reconfigure the scheduler. The sink is detached first: restarting the schedule would remove its rows,
+        # and the schedule file may be that sink
+        self._schedule_result.detach_sink()
         self.configure_json(configuration)
         logger.info(f"Configuration loaded from {json_filename}")
 
-        # Load schedule results from Excel
-        self._schedule_result = pd.read_excel(excel_filename)
+        # Load schedule results from Excel, or attach the sink
+        if excel_filename.lower().endswith((".xlsx", ".xls")):
+            self._schedule_result.load_dataframe(pd.read_excel(excel_filename))
+        else:
+            self._schedule_result.load_sink(open_schedule_sink(excel_filename))
         logger.info(f"Schedule results loaded from {excel_filename}")
 
         # Reset the current time to the maximum time in the schedule results
-        if not self._schedule_result.empty:
-            self._current_time = self._schedule_result["Finish"].max()
-        else:
-            self._current_time = 0
+        self._current_time = self._schedule_result.max_finish()
 
         logger.info(f"Scheduler reloaded. Current time set to {self._current_time}.")
 
     def _schedule_next(self):
         assert self._taskset is not None, "TaskSet is not set. Cannot schedule tasks."
         assert self._resourceset is not None, "ResourceSet is not set. Cannot schedule resources."
-        assert self._schedule_current is not None, "Schedule current is not set. Cannot schedule tasks."
-        self._schedule_current["Executed"] = False
+        stats = self._stats
+        if stats is not None:
+            start = stats.now()
+            rows_before = len(self._schedule_result)
+        for job in self._jobs.values():
+            job.executed = False
+        self._dispatched = []
+        self._dispatched_rows = []
 
         # Update schedule current with new task activations
         for task in self._taskset.tasks:
             if (self._current_time - task.first_activation) % task.period == 0:
-                absolute_deadline = self._current_time + task.deadline
-                self._schedule_current = pd.concat([
-                    self._schedule_current,
-                    pd.DataFrame([dict(
-                        Task=task.name,
-                        Activation=self._current_time,
-                        Phase=0,
-                        Request=task.phases[0].duration,
-                        Executed=False,
-                        NonPreemptiveResource="",
-                        AbsoluteDeadline=absolute_deadline  # Store the absolute deadline
-                    )], index=[task.name + "_" + str(self._current_time)])
-                ])
+                job = Job(self._next_job_id, task, self._current_time)
+                self._activate_job(job)
+                self._next_job_id += 1
+        if stats is not None:
+            start = stats.add("activation", start)
 
         # Check for repeated state before scheduling
         current_state = self._capture_current_state()
-        self._is_repeated_state(current_state)
-
-        # List jobs where Request is 0 and current_time equals the last activation plus the task period
-        jobs_to_remove = []
-        for job in self._schedule_current.index:
-            task = self._taskset.get_task(self._schedule_current.loc[job]["Task"])
-            assert task is not None, f"Task {self._schedule_current.loc[job]['Task']} not found in TaskSet."
-            last_activation = self._schedule_current.loc[job]["Activation"]
-            if self._schedule_current.loc[job]["Request"] == 0 and self._current_time >= last_activation + task.period:
-                jobs_to_remove.append(job)
-
-        # Process the listed jobs (if needed, you can add specific logic here)
-        for job in jobs_to_remove:
-            self._schedule_current.drop([job], inplace=True)
+        if stats is not None:
+            start = stats.add("capture_state", start)
+        if self._track_states:
+            self._is_repeated_state(current_state)
+        if stats is not None:
+            start = stats.add("repeated_state", start)
+            nb_jobs = len(self._jobs)
+
+        # Remove jobs where Request is 0 and current_time equals the last activation plus the task period
+        jobs_to_remove = [job.id for job in self._jobs.values() if job.request == 0 and self._current_time >= job.activation + job.task.period]
+        for job_id in jobs_to_remove:
+            del self._jobs_by_name[self._jobs[job_id].name]
+            del self._jobs[job_id]
+        if stats is not None:
+            start = stats.add("job_removal", start)
 
         # Save the current state and time to the history
-        self._previous_states.append((current_state, self._current_time))
-
-        available_resources = self._resourceset.resources.copy()
+        if self._track_states and self._is_comparable_state(current_state):
+            self._previous_states.setdefault(current_state, self._current_time)
+        if self._record_state_history:
+            self._state_history.append((current_state, self._current_time))
+        if stats is not None:
+            start = stats.add("state_history", start)
+
+        # Free resources of each type, the first free one in ResourceSet order is allocated first
+        pools = self._resourceset.free_pools()
+        processor_pool = pools[ResourceType.Processor]
+        memory_pool = pools[ResourceType.Memory]
 
         # Schedule non-preemptive jobs/resources
-        jobs_selected_non_premptive = self._schedule_current[
-            (self._schedule_current["NonPreemptiveResource"] != "") &
-            (self._schedule_current["Request"] > 0) &
-            (self._schedule_current["Executed"] == False)
-        ].index.tolist()
+        jobs_selected_non_premptive = [job for job in self._jobs.values() if job.non_preemptive_resources and job.request > 0 and job.executed == False]
 
         for job_selected in jobs_selected_non_premptive:
-            resources_names = self._schedule_current.loc[job_selected]["NonPreemptiveResource"].split(",")
-            resources_names = [x.strip() for x in resources_names]
-            resources = []
-            for resource_name in resources_names:
-                resource = self._resourceset.get_resource(resource_name)
-                resources.append(resource)
+            resources = list(job_selected.non_preemptive_resources)
             self._schedule_job_on_resources(resources, job_selected)
             for resource in resources:
-                available_resources.remove(resource)
+                pools[resource.type].take(resource)
+        if stats is not None:
+            start = stats.add("non_preemptive_dispatch", start)
 
         # Try to schedule next jobs on resources
-        jobs_sorted = self._sort_jobs_by_priority()
-        for job in jobs_sorted:
-            if (available_resources == []):
+        jobs_by_priority = self._jobs_by_priority()
+        if stats is not None:
+            jobs_by_priority = stats.timed("priority_sort", jobs_by_priority)
+        for job in jobs_by_priority:
+            if processor_pool.available == 0 and memory_pool.available == 0:
                 break
 
-            task_name = self._schedule_current.loc[job]["Task"]
-            job_current_phase = self._schedule_current.loc[job]["Phase"]
-            if isinstance(job_current_phase, pd.Series):
-                job_current_phase = job_current_phase.iloc[0]
-            task = self._taskset.get_task(str(task_name))
-            assert task is not None, f"Task {task_name} not found in TaskSet."
-            task_resource_types = [task.phases[job_current_phase].ressource_type]
-            if self._memory_use_processor and task.phases[job_current_phase].ressource_type == ResourceType.Memory:
-                task_resource_types.append(ResourceType.Processor)
-
-            # Check if resource is available
-            selected_resource = []
-            task_resource_types_temp = task_resource_types.copy()
-            for resource in available_resources:
-                if resource.type in task_resource_types_temp:
-                    selected_resource.append(resource)
-                    task_resource_types_temp.remove(resource.type)
-                    if (task_resource_types_temp == []):
-                        break
-
-            # If all resources are available, schedule the job
+            phase_resource_type = job.task.phase_resource_types[job.phase]
+            if self._memory_use_processor and phase_resource_type == ResourceType.Memory:
+                # The memory phase needs a memory and a processor, both free
+                if memory_pool.available == 0 or processor_pool.available == 0:
+                    continue
+                selected_resource = [memory_pool.allocate(), processor_pool.allocate()]
+                # Rows are written in ResourceSet order
+                selected_resource.sort(key=self._resourceset.position)
+            else:
+                resource = pools[phase_resource_type].allocate()
+                if resource is None:
+                    continue
+                selected_resource = [resource]
+
             # Schedule job on resource
-            if (task_resource_types_temp == []):
-                self._schedule_job_on_resources(selected_resource, job)
-                for ressource in selected_resource:
-                    available_resources.remove(ressource)
+            self._schedule_job_on_resources(selected_resource, job)
+        if stats is not None:
+            jobs_by_priority.close() # Counts the jobs pulled when the loop stopped early
+            start = stats.add("resource_matching", start)
+        self._restore_ready_queue()
+        if stats is not None:
+            start = stats.add("ready_queue_restore", start)
 
         # Handle non-resumable memory phase preemptions
-        for job in self._schedule_current.index:
-            job_row = self._schedule_current.loc[job]
-            task = self._taskset.get_task(job_row["Task"])
-            assert task is not None, f"Task {job_row['Task']} not found in TaskSet."
-            phase = task.phases[job_row["Phase"]]
+        for job in self._jobs.values():
+            phase = job.task.phases[job.phase]
             # Check if job is in a memory phase and active
-            if phase.ressource_type == ResourceType.Memory and job_row["Request"] > 0:
+            if phase.ressource_type == ResourceType.Memory and job.request > 0:
                 # Check if non-resumable (global or local)
                 is_non_resumable = self._memory_non_resumable_global or not phase.resumable
                 if is_non_resumable:
-                    # Was scheduled at t-1 but not at t
-                    was_scheduled = False
-                    if self._schedule_result is not None and self._current_time > 0:
-                        prev_time = self._current_time - 1
-                        prev_sched = self._schedule_result[
-                            (self._schedule_result["Job"] == job) &
-                            (self._schedule_result["Start"] == prev_time) &
-                            (self._schedule_result["Resource"] != "")
-                        ]
-                        was_scheduled = not prev_sched.empty
-                    is_scheduled_now = False
-                    if self._schedule_result is not None:
-                        curr_sched = self._schedule_result[
-                            (self._schedule_result["Job"] == job) &
-                            (self._schedule_result["Start"] == self._current_time) &
-                            (self._schedule_result["Resource"] != "")
-                        ]
-                        is_scheduled_now = not curr_sched.empty
-                    if was_scheduled and not is_scheduled_now and (self._schedule_current.loc[job, "Request"] != phase.duration):
+                    # Was scheduled at t-1 but not at t (last dispatch would be t)
+                    preempted = job.last_dispatch_time == self._current_time - 1
+                    if preempted and (job.request != phase.duration):
                         # Preempted and non-resumable: reset phase duration
-                        self._schedule_current.loc[job, "Request"] = phase.duration
-                        logger.info(f"At time {self._current_time}, Job {job} memory phase non resumable: reset to full duration after preemption.")
-
-        # Check for missed deadlines
-        for job in self._schedule_current.index.tolist():
-            if self._current_time + 1 >= self._schedule_current.loc[job, "AbsoluteDeadline"] and self._schedule_current.loc[job, "Request"] > 0: # type: ignore
-                task = self._taskset.get_task(self._schedule_current.loc[job]["Task"])
-                assert task is not None, f"Task {self._schedule_current.loc[job]['Task']} not found in TaskSet."
-                job_current_phase = self._schedule_current.loc[job]["Phase"]
-                self._schedule_result = pd.concat([
-                    self._schedule_result,
-                    pd.DataFrame([dict(
-                        Task=task.name,
-                        Job=job,
-                        Start=self._current_time + 1,
-                        Finish=self._current_time + 1,
-                        Resource="",
-                        Missed="Missed",
-                        Phase=job_current_phase + 1,
-                        RequestPhaseRemaining=self._schedule_current.loc[job, "Request"],
-                        TotalPhase=len(task.phases),
-                        TotalRequestPhase=task.phases[job_current_phase].duration,
-                        NonPreemptiveResource=self._schedule_current.loc[job, "NonPreemptiveResource"]
-                    )])
-                ])
+                        job.request = phase.duration
+                        logger.info(f"At time {self._current_time}, Job {job.name} memory phase non resumable: reset to full duration after preemption.")
+        if stats is not None:
+            start = stats.add("non_resumable_check", start)
+
+        # Check for missed deadlines, each job is reported once, when its deadline is reached unfinished
+        while self._deadline_queue and self._current_time + 1 >= self._deadline_queue[0][0]:
+            _, _, job = heapq.heappop(self._deadline_queue)
+            if job.request > 0:
+                self._missed_jobs.append(job)
+                task = job.task
+                job_current_phase = job.phase
+                self._schedule_result.append(
+                    task=task.name,
+                    job=job.name,
+                    start=self._current_time + 1,
+                    finish=self._current_time + 1,
+                    resource="",
+                    missed="Missed",
+                    phase=job_current_phase + 1,
+                    request_phase_remaining=job.request,
+                    total_phase=len(task.phases),
+                    total_request_phase=task.phase_durations[job_current_phase],
+                    non_preemptive_resource=job.non_preemptive_resource
+                )
+        if stats is not None:
+            stats.add("missed_deadline_scan", start)
+            stats.tick(nb_jobs, len(self._schedule_result) - rows_before, {
+                "jobs": nb_jobs,
+                "ready_queue": len(self._ready_queue),
+                "deadline_queue": len(self._deadline_queue),
+                "previous_states": len(self._previous_states),
+                "result_rows_in_memory": len(self._schedule_result) - self._schedule_result.first_row_in_memory,
+            })
 
         self._current_time += 1
     
-    def schedule(self, max_time: int = 40, stop_on_repeated_state: bool = False, stop_on_missed_deadline: bool = False):
+    def _next_event_stretch(self, max_time: int) -> int:
+        """
+        Count the ticks following the one just scheduled that would repeat exactly the same decisions.
+
+        The stretch stops before the next activation, before a dispatched job completes its phase,
+        before any active job could miss its deadline, and at max_time.
         """
-        Run the scheduling process up to max_time with optional stop conditions.
+        assert self._taskset is not None, "TaskSet is not set. Cannot compute the next event."
+        next_time = self._current_time
+        stretch = max_time - next_time
+        for task in self._taskset.tasks:
+            next_activation = next_time + (task.first_activation - next_time) % task.period
+            stretch = min(stretch, next_activation - next_time)
+        # A miss is reported at tick u when u + 1 >= AbsoluteDeadline
+        while self._deadline_queue and self._deadline_queue[0][2].request == 0:
+            heapq.heappop(self._deadline_queue)
+        if self._deadline_queue:
+            stretch = min(stretch, self._deadline_queue[0][0] - 1 - next_time)
+        for job, phase in self._dispatched:
+            if job.phase != phase or job.request == 0:
+                return 0
+            stretch = min(stretch, job.request)
+        return max(stretch, 0)
+
+    def _schedule_stretch(self, stretch: int):
+        """Repeat the tick just scheduled for stretch more ticks, extending its result rows."""
+        for job, _ in self._dispatched:
+            job.request -= stretch
+            job.last_dispatch_time += stretch
+            if job.request == 0:
+                self._next_job_phase(job)
+        self._schedule_result.extend_finish(self._dispatched_rows, stretch)
+        self._current_time += stretch
+
+    def schedule(self, max_time: int = 40, stop_on_repeated_state: bool = False, stop_on_missed_deadline: bool = False, event_driven: bool = False, feasibility_interval: bool = False, progress: Optional[Callable[[int, int], None]] = None, progress_interval: int = 100, cancel_token: Optional[CancellationToken] = None):
+        """
+        Run the scheduling process from time 0 up to max_time with optional stop conditions.
         
         Parameters:
         - max_time (int): Maximum time to run the scheduler.
         - stop_on_repeated_state (bool): Stop scheduling if a repeated state is detected.
         - stop_on_missed_deadline (bool): Stop scheduling if a missed deadline is detected.
+        - event_driven (bool): Jump from one scheduling event (activation, phase completion, deadline) to the next
+          instead of stepping one time unit at a time. Each stretch between events is recorded as one multi-unit
+          row per resource, whose RequestPhaseRemaining is the request at the start of the stretch.
+          States are only captured, and compared, at events.
+        - feasibility_interval (bool): Ignore max_time and schedule up to the feasibility interval of the TaskSet
+          (max first activation plus twice the hyperperiod), stopping as soon as a state repeats.
+          The cycle found is then available through the cycle property.
+        - progress (callable): Called as progress(current_time, max_time) every progress_interval time units, and once
+          when the schedule stops.
+        - progress_interval (int): Time units between two calls of progress.
+        - cancel_token (CancellationToken): Stop the schedule when cancelled. The result is then consistent up to
+          current_time, the last completed tick, and the schedule can be continued with schedule_until.
         """
-        assert self._schedule_current is not None, "Schedule current is not set. Cannot schedule tasks."
         self._restart_schedule()
+        if feasibility_interval:
+            assert self._taskset is not None, "TaskSet is not set. Cannot compute the feasibility interval."
+            max_time = self._taskset.feasibility_interval
+
+        self._schedule_until(max_time, stop_on_repeated_state, stop_on_missed_deadline, event_driven, stop_on_cycle=feasibility_interval, progress=progress, progress_interval=progress_interval, cancel_token=cancel_token)
 
-        for t in range(max_time):
-            self._current_time = t
+    def schedule_until(self, max_time: int, stop_on_repeated_state: bool = False, stop_on_missed_deadline: bool = False, event_driven: bool = False, progress: Optional[Callable[[int, int], None]] = None, progress_interval: int = 100, cancel_token: Optional[CancellationToken] = None):
+        """
+        Continue the current schedule from the current time up to max_time, keeping the jobs, results and states already computed.
+        
+        Scheduling from 0 to 1000 then continuing up to 5000 gives the same result as scheduling from 0 to 5000,
+        in unit steps or with merge_intervals. With event_driven and without merge_intervals, rows are split at
+        the end of each stretch, and so at 1000 too: a row running across 1000 is two rows instead of one.
+        Only the schedule expanded tick by tick is then the same.
+        Parameters are the same as for schedule.
+        """
+        self._schedule_until(max_time, stop_on_repeated_state, stop_on_missed_deadline, event_driven, progress=progress, progress_interval=progress_interval, cancel_token=cancel_token)
+
+    def step(self, n: int = 1, stop_on_repeated_state: bool = False, stop_on_missed_deadline: bool = False, event_driven: bool = False):
+        """Continue the current schedule for n time units."""
+        self._schedule_until(self._current_time + n, stop_on_repeated_state, stop_on_missed_deadline, event_driven)
+
+    def _schedule_until(self, max_time: int, stop_on_repeated_state: bool, stop_on_missed_deadline: bool, event_driven: bool, stop_on_cycle: bool = False, progress: Optional[Callable[[int, int], None]] = None, progress_interval: int = 100, cancel_token: Optional[CancellationToken] = None):
+        assert progress_interval > 0, "The progress interval must be positive."
+        next_progress_time = self._current_time + progress_interval
+        # Streamed to a sink, the memory stays bounded: previous states are only kept when a stop needs them
+        self._track_states = self._schedule_result.sink is None or stop_on_repeated_state or stop_on_cycle
+        while self._current_time < max_time:
+            # Cancelled between two ticks: the schedule is consistent up to the current time
+            if cancel_token is not None and cancel_token.cancelled:
+                logger.warning(f"Scheduling cancelled at time {self._current_time}.")
+                break
+
+            # Stop at the first cycle, the schedule is periodic from there
+            if stop_on_cycle and len(self.repeated_states) > 0:
+                cycle = self.cycle
+                assert cycle is not None
+                logger.info(
+                    f"Stopping scheduling at time {self._current_time}: schedule is periodic from time {cycle['Start']} "
+                    f"with a cycle of length {cycle['Length']}."
+                )
+                break
 
             # Check for repeated state
             if stop_on_repeated_state and len(self.repeated_states) > 0:
@@ -563,16 +884,35 @@ class Scheduler(ABC):
                 break
 
             # Check for missed deadlines
-            missed_deadlines = self._schedule_current[
-                (self._schedule_current["Request"] > 0) & 
-                (self._current_time >= self._schedule_current["AbsoluteDeadline"])
-            ]
-            if stop_on_missed_deadline and not missed_deadlines.empty:
-                missed_tasks = missed_deadlines["Task"].unique()
+            self._missed_jobs = [job for job in self._missed_jobs if job.request > 0]
+            if stop_on_missed_deadline and self._missed_jobs:
+                missed_tasks = list(dict.fromkeys(job.task.name for job in self._missed_jobs))
                 logger.warning(
                     f"Stopping scheduling at time {self._current_time} due to missed deadline by tasks: {', '.join(missed_tasks)}."
                 )
                 break
 
             # Perform scheduling for the current time step
-            self._schedule_next()
\ No newline at end of file
+            self._schedule_next()
+
+            # Skip the following time steps that repeat the same decisions, unless a missed deadline stops the schedule
+            if event_driven and not (stop_on_missed_deadline and self._missed_jobs):
+                if self._stats is not None:
+                    start = self._stats.now()
+                stretch = self._next_event_stretch(max_time)
+                if stretch > 0:
+                    self._schedule_stretch(stretch)
+                if self._stats is not None:
+                    self._stats.add("event_stretch", start)
+                    self._stats.stretch(stretch)
+
+            # Write the finished rows to the sink once the in-memory window is full
+            self._schedule_result.flush(self._current_time)
+
+            if progress is not None and self._current_time >= next_progress_time:
+                progress(self._current_time, max_time)
+                next_progress_time = self._current_time + progress_interval
+
+        self._schedule_result.flush(self._current_time, force=True)
+        if progress is not None:
+            progress(self._current_time, max_time)
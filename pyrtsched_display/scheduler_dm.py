@@ -1,10 +1,13 @@
-from . import Scheduler
-from . import Resource
+from . import Scheduler, PriorityType
+from . import Job
+from .analysis import Verdict
 
 class SchedulerDM(Scheduler):
+    _priority_type = PriorityType.Task
 
-    def _job_priority(self, job_name: str) -> int: # Job relative deadline.
-        task_name = self._schedule_current.loc[job_name]["Task"]
-        task = self._taskset.get_task(task_name)
-        job_deadline = task.deadline
-        return job_deadline
\ No newline at end of file
+    def _job_priority(self, job: Job) -> int: # Job relative deadline.
+        job_deadline = job.task.deadline
+        return job_deadline
+
+    def analyse(self) -> tuple[Verdict, str]: # Response-time analysis
+        return self._schedulability_analysis().dm()
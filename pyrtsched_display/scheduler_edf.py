@@ -1,11 +1,13 @@
-from . import Scheduler
-from . import Resource
+from . import Scheduler, PriorityType
+from . import Job
+from .analysis import Verdict
 
 class SchedulerEDF(Scheduler):
+    _priority_type = PriorityType.Job
     
-    def _job_priority(self, job_name: str) -> int: # Job absolute deadline.
-        task_name = self._schedule_current.loc[job_name]["Task"]
-        task = self._taskset.get_task(task_name)
-        job_activation = self._schedule_current.loc[job_name]["Activation"]
-        job_deadline = job_activation + task.deadline
-        return job_deadline
\ No newline at end of file
+    def _job_priority(self, job: Job) -> int: # Job absolute deadline.
+        job_deadline = job.activation + job.task.deadline
+        return job_deadline
+
+    def analyse(self) -> tuple[Verdict, str]: # Processor-demand test
+        return self._schedulability_analysis().edf()
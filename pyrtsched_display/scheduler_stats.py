@@ -0,0 +1,129 @@
+import json
+import time
+from typing import Iterator, Optional
+
+class SchedulerStats:
+    """
+    Cumulative wall time and calls of the stages of a scheduler tick, with the number of jobs and result rows
+    per tick and the peak size of the scheduler tables. Filled by the scheduler when collect_stats is set.
+
+    Stages, in the order of a tick: activation, capture_state, repeated_state, job_removal, state_history,
+    non_preemptive_dispatch, priority_sort (jobs pulled from the ready queue or sorted, during the dispatch loop),
+    resource_matching, ready_queue_restore, non_resumable_check, missed_deadline_scan, then event_stretch
+    for event-driven schedules. Each stage counts one call per tick where it runs; the jobs pulled by priority_sort
+    are counted apart in jobs_pulled.
+    """
+    stages = ["activation", "capture_state", "repeated_state", "job_removal", "state_history", "non_preemptive_dispatch", "priority_sort", "resource_matching", "ready_queue_restore", "non_resumable_check", "missed_deadline_scan", "event_stretch"]
+    tables = ["jobs", "ready_queue", "deadline_queue", "previous_states", "result_rows_in_memory"]
+    _time = {}
+    _calls = {}
+    _ticks = 0
+    _stretched_ticks = 0
+    _jobs = 0
+    _max_jobs = 0
+    _jobs_pulled = 0
+    _max_jobs_pulled = 0
+    _rows = 0
+    _max_rows = 0
+    _peaks = {}
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._time = {stage: 0.0 for stage in self.stages}
+        self._calls = {stage: 0 for stage in self.stages}
+        self._ticks = 0
+        self._stretched_ticks = 0
+        self._jobs = 0
+        self._max_jobs = 0
+        self._jobs_pulled = 0
+        self._max_jobs_pulled = 0
+        self._rows = 0
+        self._max_rows = 0
+        self._peaks = {table: 0 for table in self.tables}
+
+    @staticmethod
+    def now() -> float:
+        return time.perf_counter()
+
+    def add(self, stage: str, start: float) -> float:
+        """Add the time elapsed since start to the stage, and return the current time as the start of the next stage."""
+        now = time.perf_counter()
+        self._time[stage] += now - start
+        self._calls[stage] += 1
+        return now
+
+    def timed(self, stage: str, iterator: Iterator) -> Iterator:
+        """
+        Iterate while adding the time spent in the iterator to the stage. The iteration counts as one call of the stage,
+        like the other stages, and the values pulled are counted in jobs_pulled.
+        """
+        self._calls[stage] += 1
+        pulled = 0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    value = next(iterator)
+                except StopIteration:
+                    self._time[stage] += time.perf_counter() - start
+                    return
+                self._time[stage] += time.perf_counter() - start
+                pulled += 1
+                yield value
+        finally:
+            # Also reached when the dispatch loop stops before the end of the queue
+            self._jobs_pulled += pulled
+            self._max_jobs_pulled = max(self._max_jobs_pulled, pulled)
+
+    def tick(self, jobs: int, rows: int, sizes: dict):
+        """Record a tick: number of active jobs, result rows appended, and the size of each table."""
+        self._ticks += 1
+        self._jobs += jobs
+        self._max_jobs = max(self._max_jobs, jobs)
+        self._rows += rows
+        self._max_rows = max(self._max_rows, rows)
+        for table, size in sizes.items():
+            if size > self._peaks[table]:
+                self._peaks[table] = size
+
+    def stretch(self, ticks: int):
+        """Record ticks skipped by an event-driven stretch."""
+        self._stretched_ticks += ticks
+
+    def to_dict(self) -> dict:
+        times = dict(self._time)
+        # Resource matching is timed around the whole dispatch loop, which also pulls the jobs by priority:
+        # priority_sort only holds these pulls, the ready queue restore has its own stage
+        times["resource_matching"] = max(times["resource_matching"] - times["priority_sort"], 0.0)
+        total = sum(times.values())
+        return {
+            "ticks": self._ticks,
+            "stretched_ticks": self._stretched_ticks,
+            "total_time": total,
+            "time_per_tick": total / self._ticks if self._ticks > 0 else 0.0,
+            "stages": {stage: {"time": times[stage], "calls": self._calls[stage], "share": times[stage] / total if total > 0 else 0.0} for stage in self.stages},
+            "jobs_per_tick": {"mean": self._jobs / self._ticks if self._ticks > 0 else 0.0, "max": self._max_jobs},
+            "jobs_pulled": {"total": self._jobs_pulled, "mean": self._jobs_pulled / self._calls["priority_sort"] if self._calls["priority_sort"] > 0 else 0.0, "max": self._max_jobs_pulled},
+            "rows_per_tick": {"mean": self._rows / self._ticks if self._ticks > 0 else 0.0, "max": self._max_rows},
+            "peak_sizes": dict(self._peaks),
+        }
+
+    def to_json(self, filename: Optional[str] = None) -> str:
+        """Statistics as JSON, also written to filename if given."""
+        data = json.dumps(self.to_dict(), indent=4)
+        if filename is not None:
+            with open(filename, "w") as json_file:
+                json_file.write(data)
+        return data
+
+    def __str__(self):
+        data = self.to_dict()
+        lines = [f"{data['ticks']} ticks ({data['stretched_ticks']} stretched), {data['time_per_tick'] * 1e6:.1f} us per tick"]
+        for stage, values in data["stages"].items():
+            lines.append(f"  {stage:<24} {values['time'] * 1e3:>10.2f} ms {values['share'] * 100:>6.1f}% {values['calls']:>10} calls")
+        lines.append(f"  jobs per tick: {data['jobs_per_tick']['mean']:.2f} (max {data['jobs_per_tick']['max']}), rows per tick: {data['rows_per_tick']['mean']:.2f} (max {data['rows_per_tick']['max']})")
+        lines.append(f"  jobs pulled per dispatch loop: {data['jobs_pulled']['mean']:.2f} (max {data['jobs_pulled']['max']}, total {data['jobs_pulled']['total']})")
+        lines.append(f"  peak sizes: {data['peak_sizes']}")
+        return "\n".join(lines)
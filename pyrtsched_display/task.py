@@ -1,12 +1,15 @@
 from . import ResourceType
+from typing import Optional
 
 class TaskPhase:
     _ressource_type = ResourceType.Processor
     _duration = 0
     _premption = True
     _resumable = True  # True = resumable, False = non resumable
+    _task = None # Task owning the phase, notified when the type or duration changes
 
     def __init__(self, ressource_type: ResourceType, duration: int, premption: bool, resumable: bool = True):
+        self._task = None
         self._ressource_type = ressource_type
         self._duration = duration
         self._premption = premption
@@ -22,6 +25,8 @@ class TaskPhase:
     @ressource_type.setter
     def ressource_type(self, value: ResourceType):
         self._ressource_type = value
+        if self._task is not None:
+            self._task._invalidate_phase_tables()
 
     @property
     def duration(self) -> int:
@@ -30,6 +35,8 @@ class TaskPhase:
     @duration.setter
     def duration(self, value: int):
         self._duration = value
+        if self._task is not None:
+            self._task._invalidate_phase_tables()
 
     @property
     def premption(self) -> bool:
@@ -47,14 +54,31 @@ class TaskPhase:
     def resumable(self, value: bool):
         self._resumable = value
 
+    @property
+    def task(self):
+        return self._task
+
+    @task.setter
+    def task(self, value):
+        self._task = value
+
 class Task:
     _name = ""
     _first_activation = 0
     _deadline = 0
     _period = 0
     _phases = [] # List of TaskPhase
+    _taskset = None # TaskSet owning the task, notified when the name changes
+    # Phase tables, computed on first use and invalidated when phases change
+    _wcet = None
+    _phase_durations = []
+    _phase_offsets = [] # Execution time before each phase, plus the WCET as last item
+    _phase_resource_types = []
+    _demand_by_type = {}
     
     def __init__(self, name, first_activation, deadline, period):
+        self._taskset = None
+        self._wcet = None
         self._name = name
         self._first_activation = first_activation
         self._deadline = deadline
@@ -72,7 +96,23 @@ class Task:
         return string
 
     def add_phase(self, ressource_type: ResourceType, duration: int, premption: bool, resumable: bool = True):
-        self._phases.append(TaskPhase(ressource_type, duration, premption, resumable))
+        phase = TaskPhase(ressource_type, duration, premption, resumable)
+        phase.task = self
+        self._phases.append(phase)
+        self._invalidate_phase_tables()
+
+    def _invalidate_phase_tables(self):
+        self._wcet = None
+
+    def _update_phase_tables(self):
+        self._phase_durations = [phase.duration for phase in self._phases]
+        self._phase_resource_types = [phase.ressource_type for phase in self._phases]
+        self._phase_offsets = [0]
+        self._demand_by_type = {resource_type: 0 for resource_type in ResourceType}
+        for phase in self._phases:
+            self._phase_offsets.append(self._phase_offsets[-1] + phase.duration)
+            self._demand_by_type[phase.ressource_type] += phase.duration
+        self._wcet = self._phase_offsets[-1]
 
     @property
     def name(self):
@@ -81,6 +121,16 @@ class Task:
     @name.setter
     def name(self, value: str):
         self._name = value
+        if self._taskset is not None:
+            self._taskset._update_index()
+
+    @property
+    def taskset(self):
+        return self._taskset
+
+    @taskset.setter
+    def taskset(self, value):
+        self._taskset = value
 
     @property
     def first_activation(self) -> int:
@@ -110,6 +160,39 @@ class Task:
     def phases(self) -> list[TaskPhase]:
         return self._phases
 
+    @property
+    def wcet(self) -> int:
+        """Total execution time of the phases."""
+        if self._wcet is None:
+            self._update_phase_tables()
+        return self._wcet # type: ignore
+
+    @property
+    def phase_durations(self) -> list[int]:
+        if self._wcet is None:
+            self._update_phase_tables()
+        return self._phase_durations
+
+    @property
+    def phase_offsets(self) -> list[int]:
+        """Execution time before each phase, with the WCET as last item."""
+        if self._wcet is None:
+            self._update_phase_tables()
+        return self._phase_offsets
+
+    @property
+    def phase_resource_types(self) -> list[ResourceType]:
+        if self._wcet is None:
+            self._update_phase_tables()
+        return self._phase_resource_types
+
+    @property
+    def demand_by_type(self) -> dict[ResourceType, int]:
+        """Total execution time of the phases, by resource type."""
+        if self._wcet is None:
+            self._update_phase_tables()
+        return self._demand_by_type
+
     def to_dict(self):
         """Convert the task to a dictionary format."""
         return {
@@ -1,4 +1,5 @@
 import json
+import math
 import pandas as pd
 from . import ResourceType
 from . import Task
@@ -6,9 +7,11 @@ from typing import Optional
 
 class TaskSet:
     _tasks = []
+    _tasks_by_name = {}
 
     def __init__(self, data):
         self._tasks = []
+        self._tasks_by_name = {}
         if (isinstance(data, str)):
             data = json.loads(data)
 
@@ -32,7 +35,7 @@ class TaskSet:
                 task.add_phase(ResourceType.Processor, task_data["E"], True)
                 task.add_phase(ResourceType.Memory, task_data["W"], True)
 
-            self._tasks.append(task)
+            self.add_task(task)
 
     def __str__(self):
         string = "Tasks:\n"
@@ -44,11 +47,33 @@ class TaskSet:
     def tasks(self) -> list[Task]:
         return self._tasks
 
-    def get_task(self, name: str) -> Optional[Task]:
+    @property
+    def hyperperiod(self) -> int:
+        """Least common multiple of the task periods."""
+        return math.lcm(*[task.period for task in self._tasks])
+
+    @property
+    def max_first_activation(self) -> int:
+        return max((task.first_activation for task in self._tasks), default=0)
+
+    @property
+    def feasibility_interval(self) -> int:
+        """Time after which the schedule of the task set is periodic: max first activation plus twice the hyperperiod."""
+        return self.max_first_activation + 2 * self.hyperperiod
+
+    def add_task(self, task: Task):
+        task.taskset = self
+        self._tasks.append(task)
+        self._tasks_by_name.setdefault(task.name, task)
+
+    def _update_index(self):
+        """Rebuild the name index, called when a task of the set is renamed."""
+        self._tasks_by_name = {}
         for task in self._tasks:
-            if task.name == name:
-                return task
-        return None
+            self._tasks_by_name.setdefault(task.name, task)
+
+    def get_task(self, name: str) -> Optional[Task]:
+        return self._tasks_by_name.get(name)
     
     def get_taskset_as_dataframe(self):
         schema_taskset={'Name': 'string', 'O': 'int', 'D': 'int', 'T': 'int'}
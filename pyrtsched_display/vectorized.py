@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+from . import TaskSet
+
+class VectorizedScheduler:
+    """
+    Simulate many task sets at once, in lock-step, with NumPy arrays.
+
+    Only task sets made of "C" tasks (a single preemptive processor phase) with D <= T are supported, on
+    nb_processors processors with DM or EDF priorities. Each task set is simulated like
+    Scheduler.schedule(feasibility_interval=True, stop_on_missed_deadline=True): up to its feasibility interval,
+    stopping after the first missed deadline or the first repeated state, and gives the same verdicts.
+
+    With D <= T and a stop at the first miss, a task has at most one active job, so a task set is a row of
+    arrays (remaining request, activation and absolute deadline by task). Within the feasibility interval,
+    a state can only repeat the state one hyperperiod before: each task set is simulated twice, the second
+    copy one hyperperiod late, and both states are compared at each time unit.
+
+    Parameters:
+    - task_sets (list): Task sets, each a list of task dictionaries with "Name", "O", "C", "D" and "T" keys.
+    - policy (str): "DM" or "EDF".
+    - nb_processors (int): Number of processors.
+    """
+    _policy = "DM"
+    _nb_processors = 1
+    _task_sets = []
+
+    def __init__(self, task_sets: list[list[dict]], policy: str = "DM", nb_processors: int = 1):
+        assert policy in ["DM", "EDF"], f"Unknown policy {policy}, expected DM or EDF."
+        assert nb_processors > 0, "At least one processor is needed."
+        for index, task_set in enumerate(task_sets):
+            for task in task_set:
+                if "C" not in task:
+                    raise ValueError(f"Task set {index}: task {task.get('Name')} has no C key, only single processor phase tasks are supported.")
+                if task["D"] > task["T"]:
+                    raise ValueError(f"Task set {index}: task {task['Name']} has a deadline larger than its period.")
+        self._task_sets = task_sets
+        self._policy = policy
+        self._nb_processors = nb_processors
+
+    def run(self) -> pd.DataFrame:
+        """
+        Simulate every task set and return one row per task set: Missed, MissedTime and MissedTask (Finish and
+        task of the first missed deadline), Repeated, PreviousTime and CurrentTime (first repeated state),
+        and StopTime.
+        """
+        nb_sets = len(self._task_sets)
+        nb_tasks = max((len(task_set) for task_set in self._task_sets), default=0)
+        names = [[task["Name"] for task in task_set] for task_set in self._task_sets]
+        result = pd.DataFrame({
+            "Missed": np.zeros(nb_sets, dtype=bool),
+            "MissedTime": np.full(nb_sets, -1, dtype=np.int64),
+            "MissedTask": [""] * nb_sets,
+            "Repeated": np.zeros(nb_sets, dtype=bool),
+            "PreviousTime": np.full(nb_sets, -1, dtype=np.int64),
+            "CurrentTime": np.full(nb_sets, -1, dtype=np.int64),
+            "StopTime": np.zeros(nb_sets, dtype=np.int64),
+        })
+        if nb_sets == 0 or nb_tasks == 0:
+            return result
+
+        # Task parameters, padded tasks are never activated (valid is False)
+        valid = np.zeros((nb_sets, nb_tasks), dtype=bool)
+        offset = np.zeros((nb_sets, nb_tasks), dtype=np.int64)
+        wcet = np.zeros((nb_sets, nb_tasks), dtype=np.int64)
+        deadline = np.zeros((nb_sets, nb_tasks), dtype=np.int64)
+        period = np.ones((nb_sets, nb_tasks), dtype=np.int64)
+        for n, task_set in enumerate(self._task_sets):
+            for k, task in enumerate(task_set):
+                valid[n, k] = True
+                offset[n, k] = task["O"]
+                wcet[n, k] = task["C"]
+                deadline[n, k] = task["D"]
+                period[n, k] = task["T"]
+        hyperperiod = np.array([TaskSet(task_set).hyperperiod for task_set in self._task_sets], dtype=np.int64)
+        max_offset = np.array([max(task["O"] for task in task_set) if task_set else 0 for task_set in self._task_sets], dtype=np.int64)
+        horizon = max_offset + 2 * hyperperiod
+
+        # Rows 0..N-1 are the task sets, rows N..2N-1 the same task sets one hyperperiod late
+        def stack(array):
+            return np.concatenate([array, array])
+        rows = np.arange(2 * nb_sets)
+        sets = stack(np.arange(nb_sets))
+        valid, offset, wcet, deadline, period = stack(valid), stack(offset), stack(wcet), stack(deadline), stack(period)
+        time = np.concatenate([np.zeros(nb_sets, dtype=np.int64), -hyperperiod])
+        remaining = np.zeros((2 * nb_sets, nb_tasks), dtype=np.int64)
+        activation = np.zeros((2 * nb_sets, nb_tasks), dtype=np.int64)
+        absolute_deadline = np.zeros((2 * nb_sets, nb_tasks), dtype=np.int64)
+        running = np.full((2 * nb_sets, self._nb_processors), -1, dtype=np.int64) # Task executed at the previous time unit, by processor
+        # Priority key: priority, then activation and task index (job creation order)
+        task_index = np.arange(nb_tasks, dtype=np.int64)
+        scale_activation = nb_tasks
+        scale_priority = (int(horizon.max()) + 1) * nb_tasks
+        no_job = np.iinfo(np.int64).max
+        nb_running = min(self._nb_processors, nb_tasks)
+
+        late = np.empty(nb_sets, dtype=np.int64) # Index of the late copy of each task set, in the current arrays
+        late[:] = np.arange(nb_sets) + nb_sets
+        done = np.zeros(nb_sets, dtype=bool)
+        missed = result["Missed"].to_numpy().copy()
+        missed_time = result["MissedTime"].to_numpy().copy()
+        missed_task = np.full(nb_sets, -1, dtype=np.int64)
+        repeated = result["Repeated"].to_numpy().copy()
+        previous_time = result["PreviousTime"].to_numpy().copy()
+        current_time = result["CurrentTime"].to_numpy().copy()
+        stop_time = result["StopTime"].to_numpy().copy()
+
+        while True:
+            # Stop conditions, checked before each time unit like Scheduler._schedule_until
+            first = rows < nb_sets
+            first_sets = sets[first]
+            stopping = first & False
+            stopping[first] = repeated[first_sets] | missed[first_sets] | (time[first] >= horizon[first_sets])
+            if stopping.any():
+                stopped_sets = sets[stopping]
+                done[stopped_sets] = True
+                stop_time[stopped_sets] = time[stopping]
+            keep = ~done[sets]
+            if not keep.any():
+                break
+            if not keep.all():
+                rows, sets = rows[keep], sets[keep]
+                valid, offset, wcet, deadline, period = valid[keep], offset[keep], wcet[keep], deadline[keep], period[keep]
+                time, remaining, activation, absolute_deadline, running = time[keep], remaining[keep], activation[keep], absolute_deadline[keep], running[keep]
+                # Rows of the late copies after compaction
+                positions = np.full(2 * nb_sets, -1, dtype=np.int64)
+                positions[rows] = np.arange(len(rows))
+                late = positions[np.arange(nb_sets) + nb_sets]
+            started = time >= 0
+
+            # Activations
+            clock = np.mod(time[:, None] - offset, period)
+            activated = valid & started[:, None] & (clock == 0)
+            remaining = np.where(activated, wcet, remaining)
+            activation = np.where(activated, time[:, None], activation)
+            absolute_deadline = np.where(activated, time[:, None] + deadline, absolute_deadline)
+
+            # Repeated state: compare each task set with its late copy, one hyperperiod before
+            first = rows < nb_sets
+            first_rows = np.nonzero(first)[0]
+            first_sets = sets[first_rows]
+            comparable = time[first_rows] - hyperperiod[first_sets] >= max_offset[first_sets]
+            if comparable.any():
+                compared_rows = first_rows[comparable]
+                compared_sets = first_sets[comparable]
+                late_rows = late[compared_sets]
+                same = (remaining[compared_rows] == remaining[late_rows]).all(axis=1) & (running[compared_rows] == running[late_rows]).all(axis=1)
+                found = compared_sets[same]
+                repeated[found] = True
+                current_time[found] = time[compared_rows[same]]
+                previous_time[found] = time[compared_rows[same]] - hyperperiod[found]
+
+            # Dispatch the highest priority jobs, one by processor in priority order
+            if self._policy == "DM":
+                priority = deadline
+            else:
+                priority = absolute_deadline
+            key = np.where(remaining > 0, priority * scale_priority + activation * scale_activation + task_index, no_job)
+            if nb_running == 1:
+                order = np.argmin(key, axis=1)[:, None]
+            else:
+                order = np.argsort(key, axis=1, kind="stable")[:, :nb_running]
+            selected_key = np.take_along_axis(key, order, axis=1)
+            executed = (selected_key != no_job) & started[:, None]
+            running = np.full((len(rows), self._nb_processors), -1, dtype=np.int64)
+            running[:, :nb_running] = np.where(executed, order, -1)
+            np.subtract.at(remaining, (np.nonzero(executed)[0], order[executed]), 1)
+
+            # Missed deadlines, reported at the time unit where time + 1 reaches the absolute deadline
+            late_jobs = (remaining > 0) & (time[:, None] + 1 >= absolute_deadline) & started[:, None]
+            missing = late_jobs.any(axis=1) & (rows < nb_sets)
+            if missing.any():
+                missing_rows = np.nonzero(missing)[0]
+                missing_sets = sets[missing_rows]
+                miss_key = np.where(late_jobs[missing_rows], absolute_deadline[missing_rows] * scale_priority + activation[missing_rows] * scale_activation + task_index, no_job)
+                missed[missing_sets] = True
+                missed_time[missing_sets] = time[missing_rows] + 1
+                missed_task[missing_sets] = np.argmin(miss_key, axis=1)
+
+            time = time + 1
+
+        result["Missed"] = missed
+        result["MissedTime"] = missed_time
+        result["MissedTask"] = [names[n][k] if k >= 0 else "" for n, k in enumerate(missed_task)]
+        result["Repeated"] = repeated
+        result["PreviousTime"] = previous_time
+        result["CurrentTime"] = current_time
+        result["StopTime"] = stop_time
+        return result